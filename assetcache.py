@@ -0,0 +1,206 @@
+import os
+import json
+import mmap
+import random
+import hashlib
+import inspect
+import pygame
+from bgpool import LayerJob
+from constants import ASSET_CACHE_BYTES
+
+# bump when a generator's output changes in a way the source hash won't catch
+ASSET_CACHE_VERSION = 1
+
+_module_hashes = {}
+
+def _source_hash(fn) -> str:
+    '''
+    hash of the file a generator lives in, so editing background.py (or wherever
+    the generator is) invalidates everything it made before
+    '''
+    path = inspect.getsourcefile(fn) or ""
+    h = _module_hashes.get(path)
+    if h is None:
+        try:
+            with open(path, "rb") as f:
+                h = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            h = ""
+        _module_hashes[path] = h
+    return h
+
+def _rng_state(value):
+    # Random instances are inputs too, their state is what matters
+    if isinstance(value, random.Random):
+        return ("Random", value.getstate())
+    return value
+
+def default_cache_dir() -> str:
+    return os.environ.get("ASTEROIDS_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "asteroids")
+
+
+class CachedJob:
+    """
+    LayerJob stand-in for a cache miss: waits on the real job and writes the
+    result to the cache the first time it's picked up.
+    """
+    def __init__(self, cache, key, job, rngs):
+        self._cache = cache
+        self._key = key
+        self._job = job
+        self._rngs = rngs
+        self._value = None
+        # inline jobs have already moved the rngs on, grab their end state now
+        # before anything else draws from them. Pool jobs set it in result()
+        self._states = [r.getstate() for r in rngs] if job.done() else None
+
+    def done(self) -> bool:
+        return self._job.done()
+
+    def result(self):
+        if self._job is not None:
+            surf = self._job.result()
+            states = self._states or [r.getstate() for r in self._rngs]
+            self._cache.store(self._key, surf, states)
+            self._value = surf
+            self._job = None
+        return self._value
+
+
+class AssetCache:
+    """
+    On-disk cache for the procedural background surfaces.
+
+    Entries are keyed by a hash of the generator (name + its source file), its
+    arguments (size, seed, counts...), any Random passed in, the pygame version
+    and ASSET_CACHE_VERSION. The pixels go to disk raw and get memory-mapped
+    straight back into a Surface on a hit, so a warm start doesn't generate
+    anything. Least recently used entries get deleted once the directory goes
+    over `max_bytes`.
+
+    Only makes sense for deterministic calls, i.e. when there's a seed.
+    """
+
+    def __init__(self, root=None, max_bytes: int = ASSET_CACHE_BYTES):
+        self.root = root or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        try:
+            os.makedirs(self.root, exist_ok=True)
+        except OSError:
+            # read-only home or similar, just run uncached
+            self.root = None
+
+    def key(self, fn, args, kwargs) -> str:
+        parts = (
+            ASSET_CACHE_VERSION,
+            pygame.version.ver,
+            fn.__module__,
+            fn.__qualname__,
+            _source_hash(fn),
+            [_rng_state(a) for a in args],
+            sorted((k, _rng_state(v)) for k, v in kwargs.items()),
+        )
+        return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    def _paths(self, key):
+        return os.path.join(self.root, key + ".raw"), os.path.join(self.root, key + ".json")
+
+    def load(self, key, rngs=()):
+        '''
+        Surface for key (or None if it's not cached). Any Random in rngs is moved
+        to the state the generator left it in.
+        Returns (found, surface) since a generator is allowed to return None.
+        '''
+        if self.root is None:
+            return False, None
+        raw_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            surf = None
+            if meta["size"] is not None:
+                with open(raw_path, "rb") as f:
+                    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                surf = pygame.image.frombuffer(buf, tuple(meta["size"]), meta["fmt"])
+            # touch so eviction sees it as recently used
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError, pygame.error):
+            return False, None
+        for rng, state in zip(rngs, meta["rngs"]):
+            rng.setstate((state[0], tuple(state[1]), state[2]))
+        self.hits += 1
+        return True, surf
+
+    def store(self, key, surf, rng_states=()):
+        if self.root is None:
+            return
+        raw_path, meta_path = self._paths(key)
+        meta = {"size": None, "fmt": None, "rngs": [list(state) for state in rng_states]}
+        try:
+            if surf is not None:
+                # opaque surfaces go as RGB, same as the pool does
+                fmt = "RGBA" if surf.get_flags() & pygame.SRCALPHA else "RGB"
+                meta["size"], meta["fmt"] = surf.get_size(), fmt
+                tmp = raw_path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(pygame.image.tobytes(surf, fmt))
+                os.replace(tmp, raw_path)
+            # meta goes last, an entry only counts once it's there
+            tmp = meta_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp, meta_path)
+        except OSError:
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-5]
+            raw_path, meta_path = self._paths(key)
+            try:
+                used = os.path.getmtime(meta_path)
+                size = os.path.getsize(meta_path)
+                if os.path.exists(raw_path):
+                    size += os.path.getsize(raw_path)
+            except OSError:
+                continue
+            entries.append((used, size, key))
+            total += size
+
+        entries.sort()
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            self.evictions += 1
+
+    def wrap(self, submit):
+        '''
+        Wraps a submit function (BackgroundPool.submit or run_inline) so hits come
+        straight off disk and misses get generated as before and then saved.
+        '''
+        def cached_submit(fn, *args, **kwargs):
+            rngs = [a for a in args if isinstance(a, random.Random)]
+            key = self.key(fn, args, kwargs)
+            found, surf = self.load(key, rngs)
+            if found:
+                return LayerJob(value=surf)
+            self.misses += 1
+            return CachedJob(self, key, submit(fn, *args, **kwargs), rngs)
+        return cached_submit
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
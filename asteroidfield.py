@@ -13,43 +13,119 @@ class AsteroidField(pygame.sprite.Sprite):
         [pygame.Vector2(0, -1), lambda x: pygame.Vector2(x * SCREEN_WIDTH, SCREEN_HEIGHT + ASTEROID_MAX_RADIUS)]
     ]
 
-    def __init__(self, *, world_w, world_h, cam, wrap_world=True):
+    rng = random    # spawn randomness, the Simulation gives it a seeded stream
+
+    def __init__(self, *, world_w, world_h, cam, wrap_world=True, asteroids=None, budget=ASTEROID_BUDGET):
         pygame.sprite.Sprite.__init__(self, self.containers)
-        self.spawn_timer = 0.0
+        self.spawn_timer = ASTEROID_SPAWN_RATE     # counts down to the next wave
+        self.despawn_timer = 0.0
 
         self.world_w = world_w
         self.world_h = world_h
         self.wrap_world = wrap_world
         self.cam = cam
 
+        # population management: the group to count/despawn from, how many we spawn up to,
+        # and a smoothed frame cost that can push that budget down
+        self.asteroids = asteroids
+        self.budget = budget
+        self.frame_cost = None
+        self.spawned = 0
+        self.despawned = 0
+
+    def report_frame_cost(self, seconds: float):
+        '''
+        feed in how long the last frame's work took (not counting the frame cap wait).
+        Only main does this, it's wall clock so headless runs and replays leave it out
+        '''
+        if self.frame_cost is None:
+            self.frame_cost = seconds
+        else:
+            self.frame_cost += (seconds - self.frame_cost) * 0.05
+
+    def effective_budget(self) -> int:
+        if self.frame_cost is None or self.frame_cost <= FRAME_COST_TARGET:
+            return self.budget
+        scaled = int(self.budget * FRAME_COST_TARGET / self.frame_cost)
+        return max(min(ASTEROID_BUDGET_MIN, self.budget), scaled)
+
+    def next_wave(self, count: int):
+        '''
+        (asteroids to spawn now, seconds until the next wave) for the current population.
+        An empty field refills in pairs at twice the base rate, a nearly full one
+        trickles in at half the rate, and a full one waits
+        '''
+        budget = self.effective_budget()
+        room = budget - count
+        if room <= 0:
+            return 0, ASTEROID_SPAWN_RATE
+        fill = count / budget
+        size = min(room, 2 if fill < 0.25 else 1)
+        return size, ASTEROID_SPAWN_RATE * (0.5 + fill)
+
+    def despawn_far(self):
+        '''
+        drop asteroids a long way from the camera (measured around the torus), the
+        player can't reach them before new ones spawn in closer anyway
+        '''
+        if self.asteroids is None:
+            return
+        cx, cy = self.cam.rect.center
+        w, h = self.world_w, self.world_h
+        max_x = SCREEN_WIDTH * ASTEROID_DESPAWN_SCREENS
+        max_y = SCREEN_HEIGHT * ASTEROID_DESPAWN_SCREENS
+        for asteroid in self.asteroids.sprites():
+            if asteroid.lod_dt:
+                # asleep in the LODScheduler, bring it up to date before judging where it is
+                asteroid.update(0.0)
+            p = asteroid.position
+            dx = p.x - cx
+            dy = p.y - cy
+            if self.wrap_world and w and h:
+                dx = (dx + w * 0.5) % w - w * 0.5
+                dy = (dy + h * 0.5) % h - h * 0.5
+            if abs(dx) > max_x or abs(dy) > max_y:
+                asteroid.kill()
+                self.despawned += 1
+
     def spawn(self, radius, position_world, velocity_world):
-        asteroid = Asteroid(position_world.x, position_world.y, radius, world_w=self.world_w, world_h=self.world_h, wrap_world=self.wrap_world)
+        asteroid = Asteroid.acquire(position_world.x, position_world.y, radius, world_w=self.world_w, world_h=self.world_h, wrap_world=self.wrap_world)
+        self.spawned += 1
         # Size-based velocity scaling: smaller = faster, larger = slower
         if asteroid.radius <= ASTEROID_MIN_RADIUS:
             # Smallest asteroids: fastest (2.0x to 2.5x)
-            asteroid.velocity = velocity_world * random.uniform(2.0, 2.5)
+            asteroid.velocity = velocity_world * self.rng.uniform(2.0, 2.5)
         elif ASTEROID_MIN_RADIUS < asteroid.radius < ASTEROID_MAX_RADIUS:
             # Medium asteroids: medium speed (1.2x to 1.8x)
-            asteroid.velocity = velocity_world * random.uniform(1.2, 1.8)
+            asteroid.velocity = velocity_world * self.rng.uniform(1.2, 1.8)
         else:
             # Largest asteroids: slowest (0.6x to 1.0x)
-            asteroid.velocity = velocity_world * random.uniform(0.6, 1.0)
+            asteroid.velocity = velocity_world * self.rng.uniform(0.6, 1.0)
 
-    def update(self, dt):
-        self.spawn_timer += dt
-        if self.spawn_timer > ASTEROID_SPAWN_RATE:
-            self.spawn_timer = 0
+    def spawn_at_edge(self):
+        # spawn a new asteroid at a random edge
+        edge = self.rng.choice(self.edges)
+        speed = self.rng.randint(40, 100)
+        velocity_world = edge[0] * speed
+        velocity_world = velocity_world.rotate(self.rng.randint(-30, 30))
 
-            # spawn a new asteroid at a random edge
-            edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
-            velocity_world = edge[0] * speed
-            velocity_world = velocity_world.rotate(random.randint(-30, 30))
+        cam_position = edge[1](self.rng.uniform(0, 1))
 
-            cam_position = edge[1](random.uniform(0, 1))
+        cam_left, cam_top = self.cam.rect.left, self.cam.rect.top
+        pos_world = pygame.Vector2(cam_position.x + cam_left, cam_position.y + cam_top)
 
-            cam_left, cam_top = self.cam.rect.left, self.cam.rect.top
-            pos_world = pygame.Vector2(cam_position.x + cam_left, cam_position.y + cam_top)
+        kind = self.rng.randint(1, ASTEROID_KINDS)
+        self.spawn(ASTEROID_MIN_RADIUS * kind, pos_world, velocity_world)
+
+    def update(self, dt):
+        self.despawn_timer += dt
+        if self.despawn_timer > ASTEROID_DESPAWN_INTERVAL:
+            self.despawn_timer = 0
+            self.despawn_far()
 
-            kind = random.randint(1, ASTEROID_KINDS)
-            self.spawn(ASTEROID_MIN_RADIUS * kind, pos_world, velocity_world)
\ No newline at end of file
+        self.spawn_timer -= dt
+        if self.spawn_timer <= 0:
+            count = len(self.asteroids) if self.asteroids is not None else 0
+            size, self.spawn_timer = self.next_wave(count)
+            for _ in range(size):
+                self.spawn_at_edge()
@@ -0,0 +1,122 @@
+import pygame
+from typing import NamedTuple
+from constants import AUDIO_CHANNELS, MUSIC_VOLUME
+
+
+class SoundEffect(NamedTuple):
+    sound: pygame.mixer.Sound
+    volume: float
+    max_voices: int     # most copies of this effect playing at once
+    priority: int       # higher can cut off lower when every channel is busy
+
+
+class AudioEngine:
+    """
+    All the game's sound in one place.
+
+    Effects get decoded once by load() and played from memory through a fixed
+    pool of channels. Each effect has a voice limit (the oldest copy gets
+    restarted instead of stacking more) and a priority for when the pool is full.
+    Music streams from disk through pygame.mixer.music instead of sitting
+    decoded in RAM.
+
+    Mute lives here too. Missing files or no audio device just mean silence,
+    never a crash.
+    """
+
+    def __init__(self, channels: int = AUDIO_CHANNELS, muted: bool = False):
+        self.enabled = pygame.mixer.get_init() is not None
+        self.muted = muted
+        self.music_volume = MUSIC_VOLUME
+        self.effects: dict[str, SoundEffect] = {}
+        self.missing: set[str] = set()
+        self._voices: list = []         # (channel, effect name, priority), oldest first
+        self._channels: list = []
+        if self.enabled:
+            pygame.mixer.set_num_channels(channels)
+            self._channels = [pygame.mixer.Channel(i) for i in range(channels)]
+
+    def load(self, name: str, path: str, *, volume: float = 1.0, max_voices: int = 4, priority: int = 0) -> bool:
+        '''
+        decode an effect up front. False (and the effect stays silent) if it can't be loaded
+        '''
+        if not self.enabled:
+            return False
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"audio: can't load {name} from {path}: {e}")
+            self.missing.add(name)
+            return False
+        sound.set_volume(volume)
+        self.effects[name] = SoundEffect(sound, volume, max(1, max_voices), priority)
+        return True
+
+    def _free_channel(self, priority: int):
+        # drop voices that have finished (or got taken by something else)
+        self._voices = [v for v in self._voices if v[0].get_busy()]
+        busy = {v[0] for v in self._voices}
+        for ch in self._channels:
+            if ch not in busy and not ch.get_busy():
+                return ch
+
+        # everything's playing: cut off the oldest of the lowest priority voices,
+        # as long as it isn't more important than what we want to play
+        lowest = min(self._voices, key=lambda v: v[2], default=None)
+        if lowest is None or lowest[2] > priority:
+            return None
+        self._voices.remove(lowest)
+        return lowest[0]
+
+    def play(self, name: str):
+        '''
+        play an effect by name, returns the Channel it's on (or None if it didn't play)
+        '''
+        if self.muted or not self.enabled:
+            return None
+        effect = self.effects.get(name)
+        if effect is None:
+            return None
+
+        self._voices = [v for v in self._voices if v[0].get_busy()]
+        mine = [v for v in self._voices if v[1] == name]
+        if len(mine) >= effect.max_voices:
+            # at the voice limit: restart the oldest copy rather than add another
+            channel = mine[0][0]
+            self._voices.remove(mine[0])
+        else:
+            channel = self._free_channel(effect.priority)
+            if channel is None:
+                return None
+
+        channel.play(effect.sound)
+        self._voices.append((channel, name, effect.priority))
+        return channel
+
+    def play_music(self, path: str, *, volume: float = None, loops: int = -1) -> bool:
+        if not self.enabled:
+            return False
+        if volume is not None:
+            self.music_volume = volume
+        try:
+            pygame.mixer.music.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"audio: can't stream music from {path}: {e}")
+            return False
+        pygame.mixer.music.set_volume(0.0 if self.muted else self.music_volume)
+        pygame.mixer.music.play(loops=loops)
+        return True
+
+    def set_muted(self, muted: bool):
+        self.muted = muted
+        if not self.enabled:
+            return
+        pygame.mixer.music.set_volume(0.0 if muted else self.music_volume)
+        if muted:
+            for ch, _, _ in self._voices:
+                ch.stop()
+            self._voices.clear()
+
+    def toggle_mute(self) -> bool:
+        self.set_muted(not self.muted)
+        return self.muted
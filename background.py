@@ -1,8 +1,24 @@
 import pygame, random
+from array import array
+from bgpool import run_inline
+
+try:
+    import numpy as np
+except ImportError:  # optional, SparseLayer falls back to a plain loop
+    np = None
 
 # very dark blue-black (looks deeper than pure black)
 SPACE = (5, 7, 12)
 
+def _convert(surf):
+    '''
+    convert() only works once a display mode is set, which isn't the case in
+    background worker processes, so skip it there
+    '''
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surf.convert()
+    return surf
+
 def _make_starfield(size, n_small=450, n_med=110, n_big=28, seed=None):
     '''
     Creates surface of randomly placed stars
@@ -22,7 +38,7 @@ def _make_starfield(size, n_small=450, n_med=110, n_big=28, seed=None):
         randrange = random.randrange
 
     w, h = size
-    surf = pygame.Surface(size).convert()
+    surf = _convert(pygame.Surface(size))
     surf.fill((0, 0, 0)) 
 
     # small stars - single pixel
@@ -43,6 +59,86 @@ def _make_starfield(size, n_small=450, n_med=110, n_big=28, seed=None):
 
     return surf
 
+STAR_SMALL, STAR_MED, STAR_BIG = 0, 1, 2
+
+def _make_star_list(size, n_small=450, n_med=110, n_big=28, seed=None):
+    '''
+    Same stars as _make_starfield (same seed -> same spots) but just the
+    positions, as flat arrays instead of a mostly black surface.
+    Args:
+        size - area the stars get scattered over
+        n_small, n_med, n_big - number of each kind
+        seed - if want to reproduce same output
+
+    returns (kinds, xs, ys)
+    '''
+    if seed is not None:
+        rnd = random.Random(seed)
+        randrange = rnd.randrange
+    else:
+        randrange = random.randrange
+
+    w, h = size
+    kinds, xs, ys = array("B"), array("i"), array("i")
+    for kind, count in ((STAR_SMALL, n_small), (STAR_MED, n_med), (STAR_BIG, n_big)):
+        for _ in range(count):
+            x, y = randrange(w), randrange(h)
+            kinds.append(kind)
+            xs.append(x)
+            ys.append(y)
+    return kinds, xs, ys
+
+def _star_stamps():
+    '''
+    one small surface per star kind, drawn the same way _make_starfield draws them.
+    returns list of (surface, (anchor x, anchor y))
+    '''
+    small = pygame.Surface((1, 1))
+    small.fill((60, 70, 95))
+
+    med = pygame.Surface((3, 3))
+    med.fill((0, 0, 0))
+    pygame.draw.circle(med, (120, 135, 170), (1, 1), 1)
+
+    big = pygame.Surface((9, 9))
+    big.fill((0, 0, 0))
+    pygame.draw.circle(big, (200, 220, 255), (4, 4), 2)
+    pygame.draw.circle(big, (40, 60, 120), (4, 4), 4, width=1)
+
+    return [(_convert(small), (0, 0)), (_convert(med), (1, 1)), (_convert(big), (4, 4))]
+
+def _make_nebula_tile(size, blobs=10, hue=(18, 26, 48), alpha=10, seed=None):
+    '''
+    _make_nebula for a tile that repeats: clouds hanging off one edge are drawn
+    again on the opposite edge, so copies line up with no seam.
+    Args same as _make_nebula
+    '''
+    if seed is not None:
+        rnd = random.Random(seed)
+        randrange = rnd.randrange
+        randint = rnd.randint
+    else:
+        randrange = random.randrange
+        randint = random.randint
+
+    w, h = size
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+
+    for _ in range(blobs):
+        r = randint(140, 260)
+        x, y = randrange(w), randrange(h)
+
+        for k in range(6, 0, -1):
+            a = max(1, alpha - 2 * (6 - k))
+            rk = int(r * k / 6)
+            for dx in (-w, 0, w):
+                for dy in (-h, 0, h):
+                    cx, cy = x + dx, y + dy
+                    if cx + rk < 0 or cx - rk >= w or cy + rk < 0 or cy - rk >= h:
+                        continue
+                    pygame.draw.circle(surf, (*hue, a), (cx, cy), rk)
+    return surf
+
 def _make_nebula(size, blobs=10, hue=(18, 26, 48), alpha=10, seed=None):
     '''
     Add Layers to create nebula
@@ -87,7 +183,7 @@ def create_space_background(width, height, *, darker=True, seed=None, planets=Tr
         seed - allows repeatability
     """
     # base canvas
-    bg = pygame.Surface((width, height)).convert()
+    bg = _convert(pygame.Surface((width, height)))
     bg.fill((3, 4, 8) if darker else SPACE)
 
     # subtle nebula under stars
@@ -167,16 +263,32 @@ def _make_planet_overlay(size, rng: random.Random, prob:float = 0.35, *, ref_dim
 
     return surf
 
-def _tile_blit(screen, surf, offx, offy, blend=None):
+def _tile_blit(screen, surf, offx, offy, blend=None) -> int:
+    '''
+    Tiles surf across the screen scrolled by (offx, offy). Only the part of each
+    copy that actually lands on screen gets blitted (via the area rect), so the cost
+    is about one screen's worth of pixels however big the layer is.
+    Returns the number of pixels blitted.
+    '''
     sw, sh = surf.get_size()
-    x0 = -(offx % sw)
-    y0 = -(offy % sh)
+    clip = screen.get_clip()
     flag = 0 if blend is None else blend
-
-    screen.blit(surf, (x0, y0), special_flags=flag)
-    screen.blit(surf, (x0 + sw, y0), special_flags=flag)
-    screen.blit(surf, (x0, y0 + sh), special_flags=flag)
-    screen.blit(surf, (x0 + sw, y0 + sh), special_flags=flag)
+    touched = 0
+
+    # screen position of the copy covering the clip's top-left corner
+    y = clip.top - ((clip.top + offy) % sh)
+    while y < clip.bottom:
+        top = max(y, clip.top)
+        bottom = min(y + sh, clip.bottom)
+        x = clip.left - ((clip.left + offx) % sw)
+        while x < clip.right:
+            left = max(x, clip.left)
+            right = min(x + sw, clip.right)
+            screen.blit(surf, (left, top), pygame.Rect(left - x, top - y, right - left, bottom - top), flag)
+            touched += (right - left) * (bottom - top)
+            x += sw
+        y += sh
+    return touched
 
 class ParallaxLayer:
     def __init__(self, surface: pygame.Surface, factor: float, blend=None, drift=(0.0,0.0)):
@@ -191,13 +303,115 @@ class ParallaxLayer:
         self._ox += self.driftx * dt
         self._oy += self.drifty * dt
 
-    def draw(self, screen, base_x, base_y):
+    def memory_bytes(self) -> int:
+        return self.surf.get_bytesize() * self.surf.get_width() * self.surf.get_height()
+
+    def draw(self, screen, base_x, base_y) -> int:
         offx = int(self._ox + base_x * self.factor)
         offy = int(self._oy + base_y * self.factor)
-        _tile_blit(screen, self.surf, offx, offy, blend=(self.blend or 0))
+        return _tile_blit(screen, self.surf, offx, offy, blend=(self.blend or 0))
+
+class SparseLayer:
+    """
+    Parallax layer made of small stamps placed on a period_w x period_h tile that
+    repeats forever, e.g. the stars (a 1-9px stamp each) or a planet cropped out of
+    an otherwise empty layer. Only stamps that land on screen get blitted, and the
+    memory is just the stamps plus a few ints per placement.
+    Same interface as ParallaxLayer.
+    """
+    def __init__(self, stamps, ids, xs, ys, period, factor: float, blend=None, drift=(0.0,0.0)):
+        '''
+        stamps - list of (surface, (anchor x, anchor y))
+        ids, xs, ys - stamp index and anchor position in the tile, one per placement
+        '''
+        self.stamps = [surf for surf, _ in stamps]
+        self.period = period
+        self.factor = factor
+        self.blend = blend
+        self.driftx, self.drifty = drift
+        self._ox = 0.0
+        self._oy = 0.0
+
+        # store top-left corners so drawing doesn't care about anchors
+        self.ids = array("H", ids)
+        self.xs = array("i", (x - stamps[i][1][0] for i, x in zip(ids, xs)))
+        self.ys = array("i", (y - stamps[i][1][1] for i, y in zip(ids, ys)))
+        self._pad_w = max((s.get_width() for s in self.stamps), default=0)
+        self._pad_h = max((s.get_height() for s in self.stamps), default=0)
+        if np is not None:
+            self._np = (np.frombuffer(self.ids, np.uint16), np.frombuffer(self.xs, np.int32), np.frombuffer(self.ys, np.int32))
+
+    @classmethod
+    def from_stars(cls, star_list, period, factor, blend=pygame.BLEND_ADD, drift=(0.0, 0.0)):
+        kinds, xs, ys = star_list
+        return cls(_star_stamps(), kinds, xs, ys, period, factor, blend=blend, drift=drift)
+
+    @classmethod
+    def from_surface(cls, surf, factor, blend=None, drift=(0.0, 0.0)):
+        '''
+        crop a mostly transparent layer surface down to the part with pixels in it
+        '''
+        bounds = surf.get_bounding_rect()
+        if bounds.w == 0 or bounds.h == 0:
+            return cls([], [], [], [], surf.get_size(), factor, blend=blend, drift=drift)
+        crop = surf.subsurface(bounds).copy().convert_alpha()
+        return cls([(crop, (0, 0))], [0], [bounds.x], [bounds.y], surf.get_size(), factor, blend=blend, drift=drift)
+
+    def memory_bytes(self) -> int:
+        stamps = sum(s.get_bytesize() * s.get_width() * s.get_height() for s in self.stamps)
+        return stamps + self.ids.itemsize * len(self.ids) + self.xs.itemsize * len(self.xs) * 2
+
+    def update(self, dt):
+        self._ox += self.driftx * dt
+        self._oy += self.drifty * dt
+
+    def _visible(self, offx, offy, clip):
+        '''
+        (stamp index, screen x, screen y) for every placement overlapping clip
+        '''
+        pw, ph = self.period
+        # first position at or right of (clip - stamp size), then step by the period
+        left, top = clip.left - self._pad_w, clip.top - self._pad_h
+        if np is not None:
+            ids, xs, ys = self._np
+            px = (xs - offx - left) % pw + left
+            py = (ys - offy - top) % ph + top
+            out_i, out_x, out_y = [], [], []
+            for kx in range(0, clip.right - left, pw):
+                for ky in range(0, clip.bottom - top, ph):
+                    sel = (px + kx < clip.right) & (py + ky < clip.bottom)
+                    out_i.append(ids[sel])
+                    out_x.append(px[sel] + kx)
+                    out_y.append(py[sel] + ky)
+            return zip(np.concatenate(out_i).tolist(), np.concatenate(out_x).tolist(), np.concatenate(out_y).tolist())
+
+        out = []
+        right, bottom = clip.right, clip.bottom
+        for i, x, y in zip(self.ids, self.xs, self.ys):
+            sx = (x - offx - left) % pw + left
+            while sx < right:
+                sy = (y - offy - top) % ph + top
+                while sy < bottom:
+                    out.append((i, sx, sy))
+                    sy += ph
+                sx += pw
+        return out
+
+    def draw(self, screen, base_x, base_y) -> int:
+        offx = int(self._ox + base_x * self.factor)
+        offy = int(self._oy + base_y * self.factor)
+        flag = self.blend or 0
+        stamps = self.stamps
+        batch = [(stamps[i], (x, y), None, flag) for i, x, y in self._visible(offx, offy, screen.get_clip())]
+        if batch:
+            screen.blits(batch, doreturn=False)
+        return sum(s.get_width() * s.get_height() for s, _, _, _ in batch)
+
+
+COMPACT_LAYERS = frozenset(("nebula", "stars", "planets"))
 
 class ParallaxBackground:
-    def __init__(self, w, h, *, seed=None, make_starfield=None, make_nebula=None, make_planets=None):
+    def __init__(self, w, h, *, seed=None, make_starfield=None, make_nebula=None, make_planets=None, pool=None, cache=None, compact=False):
         self.w, self.h = w, h
         self.rng = random.Random(seed) if seed is not None else random.Random()
 
@@ -208,33 +422,73 @@ class ParallaxBackground:
         self._accum_x = 0.0
         self._accum_y = 0.0
         self._prev_cam_xy = None
+        self.pixels_touched = 0     # pixels blitted by the layers since begin_frame
 
         TW, TH = w*2, h*2
+        self._tile_size = (TW, TH)
         screen_ref = min(w, h)
 
-        neb_surf = self._make_nebula((TW, TH), blobs=14, hue=(18, 26, 48), alpha=10, seed=self.rng.randrange(10**9))
-
-        stars_small = self._make_starfield((TW, TH), n_small=600, n_med=0, n_big=0, seed=self.rng.randrange(10**9))
-
-        stars_med = self._make_starfield((TW, TH), n_small=0, n_med=180, n_big=0, seed=self.rng.randrange(10**9))
-
-        stars_big = self._make_starfield((TW, TH), n_small=0, n_med=0, n_big=38, seed=self.rng.randrange(10**9))
-
-        planets = self._make_planets((TW, TH), self.rng, prob=1, ref_dim=screen_ref) or pygame.Surface((TW,TH), pygame.SRCALPHA)
-
-        neb_surf = neb_surf.convert_alpha()
-        stars_small = stars_small.convert_alpha()
-        stars_med = stars_med.convert_alpha()
-        stars_big = stars_big.convert_alpha()
-        planets = planets.convert_alpha()
-
-        self.layers = [
-            ParallaxLayer(neb_surf, factor=0.08, blend=None, drift=(2.0, 4.0)),
-            ParallaxLayer(stars_small, factor=0.12, blend=pygame.BLEND_ADD, drift=(6.0, 8.0)),
-            ParallaxLayer(stars_med, factor=0.18, blend=pygame.BLEND_ADD, drift=(9.0, 11.0)),
-            ParallaxLayer(stars_big, factor=0.22, blend=pygame.BLEND_ADD, drift=(11.0, 13.0)),
-            ParallaxLayer(planets, factor=0.42, blend=None, drift=(3.0, 4.0)),
+        # with a BackgroundPool these all build at once in other processes,
+        # the layers get picked up the first time they're needed.
+        # seeds are still drawn here in the same order, so output doesn't change
+        submit = pool.submit if pool is not None else run_inline
+        # unseeded layers would never be asked for again, no point saving them
+        if cache is not None and seed is not None:
+            submit = cache.wrap(submit)
+
+        # compact layers: stars as position lists, the nebula as a small seamless
+        # tile, the planet cropped out of its empty layer. True for all of them,
+        # or a set of names to mix and match
+        if compact is True:
+            compact = COMPACT_LAYERS
+        compact = frozenset(compact or ())
+        self.compact = compact
+
+        if "nebula" in compact:
+            # a quarter of the area, so a quarter of the clouds
+            neb_job = submit(_make_nebula_tile, (w, h), blobs=4, hue=(18, 26, 48), alpha=10, seed=self.rng.randrange(10**9))
+        else:
+            neb_job = submit(self._make_nebula, (TW, TH), blobs=14, hue=(18, 26, 48), alpha=10, seed=self.rng.randrange(10**9))
+
+        # star lists are a few hundred randrange calls, not worth a worker
+        make_stars = run_inline if "stars" in compact else submit
+        make_starfield = _make_star_list if "stars" in compact else self._make_starfield
+
+        stars_small_job = make_stars(make_starfield, (TW, TH), n_small=600, n_med=0, n_big=0, seed=self.rng.randrange(10**9))
+
+        stars_med_job = make_stars(make_starfield, (TW, TH), n_small=0, n_med=180, n_big=0, seed=self.rng.randrange(10**9))
+
+        stars_big_job = make_stars(make_starfield, (TW, TH), n_small=0, n_med=0, n_big=38, seed=self.rng.randrange(10**9))
+
+        planets_job = submit(self._make_planets, (TW, TH), self.rng, prob=1, ref_dim=screen_ref)
+
+        self._jobs = [
+            (neb_job, "nebula", dict(factor=0.08, blend=None, drift=(2.0, 4.0))),
+            (stars_small_job, "stars", dict(factor=0.12, blend=pygame.BLEND_ADD, drift=(6.0, 8.0))),
+            (stars_med_job, "stars", dict(factor=0.18, blend=pygame.BLEND_ADD, drift=(9.0, 11.0))),
+            (stars_big_job, "stars", dict(factor=0.22, blend=pygame.BLEND_ADD, drift=(11.0, 13.0))),
+            (planets_job, "planets", dict(factor=0.42, blend=None, drift=(3.0, 4.0))),
         ]
+        self._layers = None
+
+    def _make_layer(self, value, name, opts):
+        if name == "stars" and name in self.compact:
+            return SparseLayer.from_stars(value, self._tile_size, **opts)
+        if value is None:
+            value = pygame.Surface(self._tile_size, pygame.SRCALPHA)
+        if name == "planets" and name in self.compact:
+            return SparseLayer.from_surface(value, **opts)
+        return ParallaxLayer(value.convert_alpha(), **opts)
+
+    @property
+    def layers(self):
+        if self._layers is None:
+            self._layers = [self._make_layer(job.result(), name, opts) for job, name, opts in self._jobs]
+            self._jobs = None
+        return self._layers
+
+    def memory_bytes(self) -> int:
+        return sum(L.memory_bytes() for L in self.layers)
 
     def update(self, dt):
         for L in self.layers:
@@ -243,19 +497,19 @@ class ParallaxBackground:
     def draw(self, screen, cam_rect):
         bx, by = self._accum_x, self._accum_y
         for L in self.layers:
-            L.draw(screen, bx, by)
+            self.pixels_touched += L.draw(screen, bx, by)
 
     def draw_far(self, screen, cam_rect):
         bx, by = self._accum_x, self._accum_y
         for L in self.layers:
             if (L.blend or 0) == 0:
-                L.draw(screen, bx, by)
+                self.pixels_touched += L.draw(screen, bx, by)
 
     def draw_near(self, screen, cam_rect):
         bx, by = self._accum_x, self._accum_y
         for L in self.layers:
             if (L.blend or 0) != 0:
-                L.draw(screen, bx, by)
+                self.pixels_touched += L.draw(screen, bx, by)
 
     def _delta_wrap(self, curr, prev, period):
         if not period or period <= 0: return curr - prev
@@ -263,6 +517,7 @@ class ParallaxBackground:
         return ((curr - prev + half) % period) - half
     
     def begin_frame(self, cam_rect, wrap_w=None, wrap_h=None):
+        self.pixels_touched = 0
 
         cx, cy = float(cam_rect.x), float(cam_rect.y)
         if self._prev_cam_xy is None:
@@ -0,0 +1,43 @@
+"""
+Time per asteroid overlay for the original and the numpy detail generators.
+
+    python -m benchmarks.detail_gen --runs 50
+"""
+import argparse
+import random
+import time
+import pygame
+from constants import ASTEROID_MIN_RADIUS, ASTEROID_KINDS
+from asteroid import make_polygon, build_detail_surface
+from detailgen import build_detail_surface_np, available
+
+
+def time_generator(fn, radius, runs, seed):
+    rng = random.Random(seed)
+    shapes = [make_polygon(radius, rng) for _ in range(runs)]
+    start = time.perf_counter()
+    for pts in shapes:
+        fn(radius, pts, rng)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark asteroid detail overlay generation per radius.")
+    parser.add_argument("--runs", type=int, default=50, help="overlays built per radius")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    pygame.init()
+    radii = [ASTEROID_MIN_RADIUS * k for k in range(1, ASTEROID_KINDS + 1)]
+    print(f"{'radius':>6} {'pygame ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for radius in radii:
+        base = time_generator(build_detail_surface, radius, args.runs, args.seed)
+        if available():
+            fast = time_generator(build_detail_surface_np, radius, args.runs, args.seed)
+            print(f"{radius:>6} {base:>10.2f} {fast:>10.2f} {base / fast:>7.1f}x")
+        else:
+            print(f"{radius:>6} {base:>10.2f} {'n/a':>10} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Seeded benchmark scenarios for the simulation, rendering and background generation.
+
+    python -m benchmarks.run                              # everything, JSON to stdout
+    python -m benchmarks.run asteroids_500 split_storm    # just some
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json   # exit 1 on regression
+
+Each scenario runs in its own fresh process, so the peak RSS numbers belong to that
+scenario alone (that includes SDL surface memory, which tracemalloc can't see).
+Baselines are only comparable on the same machine.
+"""
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not on windows, peak RSS just isn't reported there
+    resource = None
+
+SCENARIOS = {}
+
+
+def scenario(name, frames, **params):
+    '''
+    registers a scenario: fn(seed, frames, **params) returns per-frame times in seconds
+    '''
+    def register(fn):
+        SCENARIOS[name] = (fn, frames, params)
+        return fn
+    return register
+
+
+# --- game scenarios ---
+
+def _game(seed, render=True):
+    '''
+    headless Simulation + the same background/grid main draws, with no asteroid field
+    spawning on its own so scenarios control the population
+    '''
+    from headless import init_headless
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_ROWS, WORLD_COLS
+    from camera import Camera
+    from simulation import Simulation
+    from inputs import RandomInput
+    from worldgrid import BackgroundGrid, make_tile
+    from background import ParallaxBackground, _make_starfield, _make_nebula, _make_planet_overlay
+
+    screen = init_headless()
+    random.seed(seed)
+    world_w, world_h = SCREEN_WIDTH * WORLD_COLS, SCREEN_HEIGHT * WORLD_ROWS
+    cam = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, world_w, world_h, wrap=True)
+    cam.set_deadzone(int(SCREEN_WIDTH*0.25), int(SCREEN_HEIGHT*0.25))
+    sim = Simulation(world_w, world_h, cam, input_source=RandomInput(seed))
+    sim.reset()
+    sim.field.kill()
+
+    draw = None
+    if render:
+        pbg = ParallaxBackground(SCREEN_WIDTH, SCREEN_HEIGHT, seed=seed, make_starfield=_make_starfield, make_nebula=_make_nebula, make_planets=_make_planet_overlay, compact=True)
+        grid = BackgroundGrid(SCREEN_WIDTH, SCREEN_HEIGHT, make_tile_fn=make_tile, nrows=WORLD_ROWS, ncols=WORLD_COLS)
+
+        def draw(dt):
+            screen.fill((3, 4, 8))
+            pbg.begin_frame(cam.rect, wrap_w=world_w, wrap_h=world_h)
+            pbg.update(dt)
+            pbg.draw_far(screen, cam.rect)
+            grid.draw(screen, cam.rect, wrap=cam.wrap)
+            pbg.draw_near(screen, cam.rect)
+            sim.draw(screen, cam.rect)
+    return sim, draw
+
+
+def _spawn_asteroids(sim, count, rng, kinds=None):
+    from asteroid import Asteroid
+    from constants import ASTEROID_MIN_RADIUS, ASTEROID_KINDS
+    import pygame
+    for _ in range(count):
+        kind = rng.randint(1, ASTEROID_KINDS) if kinds is None else kinds
+        a = Asteroid.acquire(rng.uniform(0, sim.world_w), rng.uniform(0, sim.world_h), ASTEROID_MIN_RADIUS * kind,
+                     world_w=sim.world_w, world_h=sim.world_h, wrap_world=True)
+        a.velocity = pygame.Vector2(0, rng.uniform(40, 160)).rotate(rng.uniform(0, 360))
+
+
+def _run_frames(sim, draw, frames, before_step=None):
+    from constants import SIM_DT
+    times = []
+    clock = time.perf_counter
+    for i in range(frames):
+        start = clock()
+        if before_step is not None:
+            before_step(i)
+        sim.step(SIM_DT)
+        if draw is not None:
+            draw(SIM_DT)
+        times.append(clock() - start)
+    return times
+
+
+def _asteroid_count(seed, frames, count, render=True):
+    sim, draw = _game(seed, render)
+    _spawn_asteroids(sim, count, random.Random(seed))
+    return _run_frames(sim, draw, frames)
+
+scenario("asteroids_50", 600, count=50)(_asteroid_count)
+scenario("asteroids_500", 600, count=500)(_asteroid_count)
+scenario("asteroids_5000", 200, count=5000)(_asteroid_count)
+scenario("asteroids_5000_sim", 200, count=5000, render=False)(_asteroid_count)
+
+
+@scenario("split_storm", 600, population=300, shots_per_frame=20)
+def _split_storm(seed, frames, population, shots_per_frame):
+    '''
+    shots dropped right on top of asteroids every frame, so the collision, split
+    and scoring paths run flat out. Big ones get topped up as they're broken down.
+    '''
+    from player import Shot
+    from constants import SHOT_RADIUS, ASTEROID_KINDS
+    sim, draw = _game(seed)
+    rng = random.Random(seed)
+    _spawn_asteroids(sim, population, rng, kinds=ASTEROID_KINDS)
+
+    def fire(_):
+        asteroids = sim.asteroids.sprites()
+        if len(asteroids) < population:
+            _spawn_asteroids(sim, population - len(asteroids), rng, kinds=ASTEROID_KINDS)
+            asteroids = sim.asteroids.sprites()
+        for target in rng.sample(asteroids, min(shots_per_frame, len(asteroids))):
+            p = target.position
+            Shot.acquire(p.x, p.y, SHOT_RADIUS, cam=sim.cam, world_w=sim.world_w, world_h=sim.world_h)
+    return _run_frames(sim, draw, frames, fire)
+
+
+@scenario("shot_spam", 600, population=200, shots_per_frame=40)
+def _shot_spam(seed, frames, population, shots_per_frame):
+    '''
+    the player sprays shots in every direction, no cooldown
+    '''
+    import pygame
+    from player import Shot
+    from constants import SHOT_RADIUS, PLAYER_SHOOT_SPEED
+    sim, draw = _game(seed)
+    rng = random.Random(seed)
+    _spawn_asteroids(sim, population, rng)
+
+    def spray(_):
+        p = sim.player.position
+        for _ in range(shots_per_frame):
+            shot = Shot.acquire(p.x, p.y, SHOT_RADIUS, cam=sim.cam, world_w=sim.world_w, world_h=sim.world_h)
+            shot.velocity = pygame.Vector2(0, 1).rotate(rng.uniform(0, 360)) * PLAYER_SHOOT_SPEED
+    return _run_frames(sim, draw, frames, spray)
+
+
+@scenario("seam_camera", 600, population=400)
+def _seam_camera(seed, frames, population):
+    '''
+    player dragged diagonally across the world's wrap seams, camera following
+    '''
+    sim, draw = _game(seed)
+    _spawn_asteroids(sim, population, random.Random(seed))
+    w, h = sim.world_w, sim.world_h
+    # start just short of the corner so the path crosses both seams early and often
+    x0, y0 = w - 300, h - 200
+    vx, vy = 37.0, 23.0
+
+    def drag(i):
+        sim.player.position.x = (x0 + vx * i) % w
+        sim.player.position.y = (y0 + vy * i) % h
+    return _run_frames(sim, draw, frames, drag)
+
+
+# --- background generation ---
+
+def _build_background(seed, cache_dir, compact):
+    from headless import init_headless
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    from assetcache import AssetCache
+    from background import ParallaxBackground, _make_starfield, _make_nebula, _make_planet_overlay
+    init_headless()
+    start = time.perf_counter()
+    pbg = ParallaxBackground(SCREEN_WIDTH, SCREEN_HEIGHT, seed=seed, make_starfield=_make_starfield, make_nebula=_make_nebula,
+                             make_planets=_make_planet_overlay, cache=AssetCache(cache_dir), compact=compact)
+    pbg.layers
+    return time.perf_counter() - start
+
+
+def _background(seed, frames, warm, compact):
+    '''
+    one "frame" = building a ParallaxBackground from nothing, each into a fresh cache
+    dir (cold) or one that already has it (warm)
+    '''
+    times = []
+    root = tempfile.mkdtemp(prefix="bench-assets-")
+    try:
+        for i in range(frames):
+            cache_dir = os.path.join(root, "shared" if warm else str(i))
+            if warm and i == 0:
+                _build_background(seed, cache_dir, compact)
+            times.append(_build_background(seed, cache_dir, compact))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return times
+
+scenario("background_cold", 5, warm=False, compact=False)(_background)
+scenario("background_warm", 5, warm=True, compact=False)(_background)
+scenario("background_cold_compact", 5, warm=False, compact=True)(_background)
+scenario("background_warm_compact", 5, warm=True, compact=True)(_background)
+
+
+# --- running / reporting ---
+
+def _percentile(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * p / 100
+    lo, hi = math.floor(k), math.ceil(k)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def run_scenario(name, seed=1, frames=None, trace_python=False) -> dict:
+    '''
+    runs one scenario in this process and returns its numbers.
+    trace_python adds the Python heap peak from tracemalloc, which slows every
+    allocation down, so frame times from those runs aren't comparable
+    '''
+    fn, default_frames, params = SCENARIOS[name]
+    frames = frames or default_frames
+    if trace_python:
+        tracemalloc.start()
+    start = time.perf_counter()
+    times = fn(seed, frames, **params)
+    wall = time.perf_counter() - start
+    if trace_python:
+        _, py_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    ordered = sorted(times)
+    total = sum(times)
+    result = {
+        "frames": len(times),
+        "fps": len(times) / total if total > 0 else 0.0,
+        "p50_ms": _percentile(ordered, 50) * 1000,
+        "p99_ms": _percentile(ordered, 99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+        "wall_seconds": wall,
+    }
+    if trace_python:
+        result["python_peak_mb"] = py_peak / 2**20
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on linux, bytes on mac
+        result["peak_rss_mb"] = rss / (2**20 if sys.platform == "darwin" else 2**10)
+    return result
+
+
+def run_isolated(name, seed=1, frames=None, trace_python=False) -> dict:
+    '''
+    run_scenario in a fresh spawned process, so memory/caches from one scenario
+    don't leak into the next
+    '''
+    with mp.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        return pool.apply(run_scenario, (name, seed, frames, trace_python))
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    '''
+    regressions against a baseline: fps down or p99 up by more than tolerance (0.1 = 10%)
+    '''
+    problems = []
+    for name, now in results.items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if before["fps"] > 0 and now["fps"] < before["fps"] * (1 - tolerance):
+            problems.append(f"{name}: fps {before['fps']:.1f} -> {now['fps']:.1f}")
+        if before["p99_ms"] > 0 and now["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            problems.append(f"{name}: p99 {before['p99_ms']:.2f}ms -> {now['p99_ms']:.2f}ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded benchmark scenarios headless.")
+    parser.add_argument("scenarios", nargs="*", help=f"any of: {', '.join(SCENARIOS)} (default all)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=None, help="override every scenario's frame count")
+    parser.add_argument("--out", default=None, help="write the JSON here instead of stdout")
+    parser.add_argument("--baseline", default=None, help="compare against this results file, exit 1 on regression")
+    parser.add_argument("--save-baseline", default=None, help="also write the results here as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed fps/p99 change vs baseline (0.10 = 10%%)")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report the Python heap peak (slows the run down)")
+    parser.add_argument("--in-process", action="store_true", help="don't spawn a process per scenario")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results = {}
+    for name in names:
+        runner = run_scenario if args.in_process else run_isolated
+        results[name] = runner(name, args.seed, args.frames, args.tracemalloc)
+        r = results[name]
+        print(f"{name:<26} {r['fps']:9.1f} fps  p50 {r['p50_ms']:7.2f} ms  p99 {r['p99_ms']:7.2f} ms", file=sys.stderr)
+
+    report = {
+        "seed": args.seed,
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "scenarios": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.tolerance)
+        for p in problems:
+            print("REGRESSION", p, file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
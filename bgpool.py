@@ -0,0 +1,85 @@
+import os
+import random
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import pygame
+
+
+def _init_worker():
+    # workers never open a window, they only draw onto plain Surfaces
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+def _render(fn, args, kwargs):
+    '''
+    runs inside a worker: build the surface and ship its raw pixels back.
+    Any Random passed in gets its end state sent back too, so the caller's rng
+    ends up exactly where it would have if the generator ran locally.
+    '''
+    surf = fn(*args, **kwargs)
+    states = [a.getstate() for a in args if isinstance(a, random.Random)]
+    if surf is None:
+        return None, None, None, states
+    # opaque surfaces go as RGB, otherwise their unused alpha byte comes back as 0
+    fmt = "RGBA" if surf.get_flags() & pygame.SRCALPHA else "RGB"
+    return surf.get_size(), fmt, pygame.image.tobytes(surf, fmt), states
+
+
+class LayerJob:
+    """
+    A background surface that may still be getting generated in another process.
+    result() blocks until it's ready and hands back a Surface (or None).
+    """
+    def __init__(self, future=None, value=None, rngs=()):
+        self._future = future
+        self._value = value
+        self._rngs = rngs
+
+    def done(self) -> bool:
+        return self._future is None or self._future.done()
+
+    def result(self):
+        if self._future is not None:
+            size, fmt, buf, states = self._future.result()
+            for rng, state in zip(self._rngs, states):
+                rng.setstate(state)
+            # frombuffer wraps the bytes as-is, no copy
+            self._value = None if buf is None else pygame.image.frombuffer(buf, size, fmt)
+            self._future = None
+        return self._value
+
+
+def run_inline(fn, *args, **kwargs) -> LayerJob:
+    return LayerJob(value=fn(*args, **kwargs))
+
+
+class BackgroundPool:
+    """
+    Process pool for the big procedural background generators (starfields, nebula,
+    planets, the menu backdrop) so they build in parallel at startup instead of
+    one after another on the main thread.
+    With one core (or workers=0) jobs just run inline.
+    """
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = min(5, os.cpu_count() or 1)
+        self.executor = None
+        if workers > 1:
+            # spawn, not fork: the parent already has SDL/audio running
+            self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"), initializer=_init_worker)
+
+    def submit(self, fn, *args, **kwargs) -> LayerJob:
+        '''
+        fn has to be a module level function so it can be pickled over to a worker
+        '''
+        if self.executor is None:
+            return run_inline(fn, *args, **kwargs)
+        rngs = [a for a in args if isinstance(a, random.Random)]
+        return LayerJob(future=self.executor.submit(_render, fn, args, kwargs), rngs=rngs)
+
+    def close(self):
+        '''
+        stop taking new work, jobs already submitted still finish
+        '''
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
@@ -2,6 +2,8 @@ import pygame
 
 # Base class for game objects
 class CircleShape(pygame.sprite.Sprite):
+    torus = None    # TorusView for the current camera, set by the Simulation like containers
+
     def __init__(self, x, y, radius):
         # we will be using this later
         if hasattr(self, "containers"):
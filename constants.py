@@ -11,10 +11,45 @@ ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
 ASTEROID_SPAWN_RATE = 0.8  # seconds
 ASTEROID_MAX_RADIUS = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
+ASTEROID_BUDGET = 80            # field stops spawning at this many asteroids (splits can still go over)
+ASTEROID_BUDGET_MIN = 20        # lowest the budget gets pushed by slow frames
+ASTEROID_DESPAWN_SCREENS = 1.5  # asteroids further than this (in screens, either axis) from the camera centre get dropped
+ASTEROID_DESPAWN_INTERVAL = 1.0 # seconds between despawn sweeps
+LOD_SECTOR_W = SCREEN_WIDTH // 4    # the LOD scheduler wakes/sleeps asteroids a sector at a time
+LOD_SECTOR_H = SCREEN_HEIGHT // 4
+LOD_MARGIN = 256            # sectors this close to the camera view are always awake
+LOD_INTERVAL = 6            # sleeping asteroids only get updated every this many sim steps
+LOD_MIN_ASTEROIDS = 200     # below this many asteroids LOD costs more than it saves, so it stays off
+ENV_OBS_ASTEROIDS = 16      # nearest asteroids in a gymenv observation
+ENV_FRAME_SKIP = 4          # sim ticks per gymenv step, the action is held for all of them
+ENV_MAX_STEPS = 4500        # gymenv episodes get cut off here (5 minutes at the default frame skip)
+ENV_DEATH_PENALTY = 1000    # taken off the reward when the ship gets hit
+FRAME_COST_TARGET = 0.012       # seconds of work per frame before the field eases off spawning
+ASTEROID_ATLAS_SEED = 1         # fixed so asteroid shapes are the same in a game and its replay
+ASTEROID_DETAIL_VARIANTS = 8    # prebuilt shape/overlay variants per asteroid size
+ROTATION_BUCKETS = 90           # overlay rotations get snapped to 360/this degree steps
+ROTATION_CACHE_BYTES = 32 * 1024 * 1024
 
 PLAYER_RADIUS = 20
 PLAYER_TURN_SPEED = 300
 PLAYER_SPEED = 200
 SHOT_RADIUS = 5
 PLAYER_SHOOT_SPEED = 500
-PLAYER_COOL_DOWN = 0.3
\ No newline at end of file
+PLAYER_COOL_DOWN = 0.3
+SIM_HZ = 60                 # fixed simulation rate, independent of the render rate
+SIM_DT = 1 / SIM_HZ
+SIM_MAX_STEPS = 5           # most sim steps run per rendered frame before we drop time
+
+AUDIO_CHANNELS = 16         # mixer channels shared by all sound effects
+MUSIC_VOLUME = 0.3
+SHOT_VOLUME = 0.1
+PROFILE_WINDOW = 240        # frames the profiler keeps for its percentiles
+PROFILE_TRACE_EVENTS = 500_000  # cap on events held for one trace export
+POOL_LIMIT = 1024            # dead shots/asteroids/stars kept per class for reuse
+MENU_IDLE_FPS = 20          # static menus (game over, stats) only poll input this often
+
+WORLD_ROWS = 5              # world is WORLD_COLS x WORLD_ROWS screens
+WORLD_COLS = 5
+ASSET_CACHE_BYTES = 256 * 1024 * 1024      # on-disk cache for generated backgrounds
+BACKGROUND_SEEDS = 8        # main picks one of this many backgrounds per launch, so they can come from the cache
+GRID_TILE_CACHE_BYTES = 48 * 1024 * 1024    # background grid tiles kept in memory before old ones get dropped
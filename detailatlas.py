@@ -0,0 +1,57 @@
+import random
+import pygame
+from typing import NamedTuple
+from constants import *
+from asteroid import make_polygon, build_detail_surface
+import detailgen
+
+
+class AsteroidVariant(NamedTuple):
+    points: list            # local polygon points, shared by every asteroid using this variant
+    surface: pygame.Surface # detail overlay drawn for that polygon
+
+
+class DetailAtlas:
+    """
+    A handful of prebuilt polygon + detail overlay pairs for every asteroid radius.
+    Built once at startup and shared by all asteroids, so spawning (and splitting)
+    is a lookup instead of ~5 surface allocations and a thousand mask probes,
+    and memory stays flat no matter how many asteroids are alive.
+    """
+
+    def __init__(self, radii=None, variants: int = ASTEROID_DETAIL_VARIANTS, seed=None, generator=None):
+        # the numpy generator gives identical overlays for the same seed, just quicker
+        if generator is None:
+            generator = detailgen.build_detail_surface_np if detailgen.available() else build_detail_surface
+        self.generator = generator
+        if radii is None:
+            radii = [ASTEROID_MIN_RADIUS * kind for kind in range(1, ASTEROID_KINDS + 1)]
+        self.variants_per_radius = variants
+        self._rng = random.Random(seed)
+        self.variants: dict[int, list[AsteroidVariant]] = {}
+        for radius in radii:
+            self._build(radius)
+
+    def _build(self, radius):
+        built = []
+        for _ in range(self.variants_per_radius):
+            points = make_polygon(radius, self._rng)
+            built.append(AsteroidVariant(points, self.generator(radius, points, self._rng)))
+        self.variants[radius] = built
+        return built
+
+    def pick(self, radius, rng=random) -> AsteroidVariant:
+        '''
+        random variant for a radius, builds the set on the spot for radii we didn't expect
+        '''
+        options = self.variants.get(radius)
+        if options is None:
+            options = self._build(radius)
+        return rng.choice(options)
+
+    def memory_bytes(self) -> int:
+        total = 0
+        for options in self.variants.values():
+            for v in options:
+                total += v.surface.get_bytesize() * v.surface.get_width() * v.surface.get_height()
+        return total
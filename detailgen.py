@@ -0,0 +1,254 @@
+import random
+import pygame
+from asteroid import build_detail_surface
+
+try:
+    import numpy as np
+except ImportError:  # optional, build_detail_surface is the fallback
+    np = None
+
+SPECK_LIGHT = (255, 26)     # (rgb value, alpha) for light specks
+SPECK_DARK = (0, 30)        # same for dark specks
+SPECK_RADIUS_MIN = 1
+SPECK_RADIUS_MAX = 5
+SPECK_TRIES = 1000
+
+_stamps = {}
+
+def _disc_offsets(r):
+    '''
+    pixel offsets pygame.draw.circle fills for radius r, grabbed from pygame itself
+    so stamped specks come out the exact same shape
+    '''
+    offs = _stamps.get(r)
+    if offs is None:
+        size = 2 * r + 3
+        probe = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(probe, (255, 255, 255, 255), (r + 1, r + 1), r)
+        xs, ys = np.nonzero(pygame.surfarray.array_alpha(probe))
+        offs = np.stack((xs - (r + 1), ys - (r + 1)), axis=1)
+        _stamps[r] = offs
+    return offs
+
+def _randint_for(rng):
+    '''
+    A randint(a, b) that pulls the exact same bits from rng as rng.randint, minus the
+    randrange/_randbelow call layers (those were most of the generation time).
+    Only used when a self check says it matches this Python's Random.
+    '''
+    if rng is random:
+        rng = random._inst
+    if not (_FAST_RANDINT_OK and type(rng) is random.Random):
+        return rng.randint
+    getrandbits = rng.getrandbits
+
+    def randint(a, b):
+        n = b - a + 1
+        k = n.bit_length()
+        r = getrandbits(k)
+        while r >= n:
+            r = getrandbits(k)
+        return a + r
+    return randint
+
+def _check_fast_randint():
+    global _FAST_RANDINT_OK
+    ref, mine = random.Random(1234), random.Random(1234)
+    _FAST_RANDINT_OK = True
+    _randint = _randint_for(mine)
+    for a, b in ((0, 0), (3, 9), (-5, 124), (1, 5), (0, 1000)):
+        for _ in range(20):
+            if ref.randint(a, b) != _randint(a, b):
+                _FAST_RANDINT_OK = False
+                return
+    _FAST_RANDINT_OK = ref.getstate() == mine.getstate()
+
+_FAST_RANDINT_OK = False
+_check_fast_randint()
+
+def available() -> bool:
+    return np is not None
+
+def build_detail_surface_np(radius, local_points, rng=random):
+    """
+    Same overlay as asteroid.build_detail_surface, but the polygon mask, the speck
+    field and the clipping are done as numpy arrays and written back with surfarray
+    in a few bulk operations, instead of ~1000 mask.get_at calls and a
+    pygame.draw.circle per speck.
+
+    It pulls numbers from `rng` in exactly the same order as the original, so the
+    same seed gives the same asteroid.
+    """
+    if np is None:
+        return build_detail_surface(radius, local_points, rng)
+
+    # constants kept in step with build_detail_surface
+    RING_LIGHT_ALPHA = 14
+    EDGE_HI_MAX_ALPHA = 50
+    EDGE_INSET_SCALE = 0.96
+    EDGE_THICK = 3
+    SPOKE_THICK = 4
+    SPOKE_START_SCALE = 0.98
+    CRATER_DENSITY = 0.05
+    CRATER_MIN_SCALE = 0.08
+    CRATER_MAX_SCALE = 0.40
+    CRATER_EDGE_INSET = 0.88
+    CRATER_TRIES = 20
+    CRATER_BASE_ALPHA = 30
+    CRATER_SHADOW_ALPHA = 35
+    CRATER_DARKRIM_ALPHA = 50
+    CRATER_LIGHTRIM_ALPHA = 40
+
+    diameter = int(radius * 2) + 4
+    size = (diameter, diameter)
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    center = pygame.Vector2(diameter // 2, diameter // 2)
+    poly_pts = [center + p for p in local_points]
+
+    # polygon mask: let pygame rasterize it once (so the inside test matches the
+    # original pixel for pixel), then everything else reads the array
+    mask_surf = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.polygon(mask_surf, (255, 255, 255, 255), poly_pts)
+    inside = pygame.surfarray.array_alpha(mask_surf) > 0      # indexed [x, y]
+    inside_rows = inside.tolist()                              # plain lists are quicker to poke one at a time
+
+    # rings/spokes/edges are a couple dozen polygon/line calls, pygame is fine for those
+    innermost_pts = poly_pts
+    layers = 7
+    for i in range(1, layers + 1):
+        s = 1.0 - 0.09 * i
+        s += rng.uniform(-0.008, 0.008)
+        inner = [center + (q - center) * s for q in poly_pts]
+        if i % 2:
+            col = (128, 128, 128, RING_LIGHT_ALPHA)
+        else:
+            t = (i - 2) / (layers - 2)
+            v = int(255 * t)
+            col = (v, v, v, RING_LIGHT_ALPHA)
+        pygame.draw.polygon(surf, col, inner)
+        if i == layers:
+            innermost_pts = inner
+
+    for i, outer_pt in enumerate(poly_pts):
+        if i % 3:
+            continue
+        start = center + (outer_pt - center) * SPOKE_START_SCALE
+        pygame.draw.line(surf, (128, 128, 128, RING_LIGHT_ALPHA), start, innermost_pts[i], width=SPOKE_THICK)
+
+    light_dir = pygame.Vector2(1.0, -0.35).normalize()
+    for i, outer_pt in enumerate(poly_pts):
+        start = center + (outer_pt - center) * SPOKE_START_SCALE
+        mid = start.lerp(innermost_pts[i], 0.5)
+        pygame.draw.line(surf, (255, 255, 255, 12), mid, mid + light_dir * 0.6, 1)
+
+    edge_overlay = pygame.Surface(size, pygame.SRCALPHA)
+    n = len(poly_pts)
+    for i in range(n):
+        a = poly_pts[i]
+        b = poly_pts[(i + 1) % n]
+        edge = b - a
+        if edge.length_squared() == 0:
+            continue
+        facing = pygame.Vector2(-edge.y, edge.x).normalize().dot(light_dir)
+        a_in = center + (a - center) * EDGE_INSET_SCALE
+        b_in = center + (b - center) * EDGE_INSET_SCALE
+        if facing > 0.12:
+            pygame.draw.line(edge_overlay, (255, 255, 255, int(EDGE_HI_MAX_ALPHA * min(1.0, facing))), a_in, b_in, width=EDGE_THICK)
+        elif facing < -0.12:
+            pygame.draw.line(edge_overlay, (0, 0, 0, int(26 * min(1.0, -facing))), a_in, b_in, width=EDGE_THICK)
+    surf.blit(edge_overlay, (0, 0))
+
+    # craters: only 1-3 of them, so the shapes stay pygame polygons, but finding
+    # a spot inside the asteroid is an array lookup now
+    crater_surf = pygame.Surface(size, pygame.SRCALPHA)
+    crater_count = max(1, int(radius * CRATER_DENSITY))
+    cr_min = max(2, int(radius * CRATER_MIN_SCALE))
+    cr_max = max(cr_min + 1, int(radius * CRATER_MAX_SCALE))
+
+    def irregular_circle_points(c, r, jaggedness=0.35, points=10):
+        return [pygame.Vector2(0, -r * (1 + rng.uniform(-jaggedness, jaggedness))).rotate((k / points) * 360) + c
+                for k in range(points)]
+
+    lo_c = int(center.x - radius * CRATER_EDGE_INSET)
+    hi_c = int(center.x + radius * CRATER_EDGE_INSET)
+    lo_cy = int(center.y - radius * CRATER_EDGE_INSET)
+    hi_cy = int(center.y + radius * CRATER_EDGE_INSET)
+    randint = _randint_for(rng)
+    for _ in range(crater_count):
+        pos = None
+        for _try in range(CRATER_TRIES):
+            x = randint(lo_c, hi_c)
+            y = randint(lo_cy, hi_cy)
+            if 0 <= x < diameter and 0 <= y < diameter and inside_rows[x][y]:
+                pos = pygame.Vector2(x, y)
+                break
+        if pos is None:
+            continue
+        r = rng.randint(cr_min, cr_max)
+        pygame.draw.polygon(crater_surf, (0, 0, 0, CRATER_BASE_ALPHA), irregular_circle_points(pos, int(r * 0.9)))
+        pygame.draw.polygon(crater_surf, (0, 0, 0, CRATER_SHADOW_ALPHA), irregular_circle_points(pos - light_dir * (r * 0.15), int(r * 0.6)))
+        pygame.draw.polygon(crater_surf, (0, 0, 0, CRATER_DARKRIM_ALPHA), irregular_circle_points(pos - light_dir * (r * 0.25), r), width=max(1, int(r * 0.25)))
+        pygame.draw.circle(crater_surf, (255, 255, 255, CRATER_LIGHTRIM_ALPHA), pos + light_dir * (r * 0.20), int(r * 0.85), width=max(1, int(r * 0.18)))
+
+    # clip to the polygon in place instead of blitting the mask with BLEND_RGBA_MIN
+    _clip_to_mask(crater_surf, inside)
+    surf.blit(crater_surf, (0, 0))
+
+    # specks: the random draws have to stay one by one to keep the seed stream
+    # identical, but everything after that is a handful of array ops
+    lo_s, hi_s = int(center.x - radius), int(center.x + radius)
+    lo_sy, hi_sy = int(center.y - radius), int(center.y + radius)
+    rand = rng.random
+    sx, sy, sr, slight = [], [], [], []
+    for _ in range(SPECK_TRIES):
+        x = randint(lo_s, hi_s)
+        y = randint(lo_sy, hi_sy)
+        if 0 <= x < diameter and 0 <= y < diameter and inside_rows[x][y]:
+            slight.append(rand() < 0.45)
+            sx.append(x)
+            sy.append(y)
+            sr.append(randint(SPECK_RADIUS_MIN, SPECK_RADIUS_MAX))
+
+    if sx:
+        sx, sy, sr = np.array(sx), np.array(sy), np.array(sr)
+        order = np.arange(len(sx))
+        # later specks draw over earlier ones, so the highest index covering a pixel wins
+        owner = np.full(size, -1, dtype=np.int64)
+        for r in range(SPECK_RADIUS_MIN, SPECK_RADIUS_MAX + 1):
+            sel = sr == r
+            if not sel.any():
+                continue
+            offs = _disc_offsets(r)
+            px = (sx[sel, None] + offs[None, :, 0]).ravel()
+            py = (sy[sel, None] + offs[None, :, 1]).ravel()
+            idx = np.repeat(order[sel], len(offs))
+            ok = (px >= 0) & (px < diameter) & (py >= 0) & (py < diameter)
+            np.maximum.at(owner, (px[ok], py[ok]), idx[ok])
+
+        covered = (owner >= 0) & inside
+        light = np.array(slight)[np.where(covered, owner, 0)]
+        value = np.where(light, SPECK_LIGHT[0], SPECK_DARK[0]).astype(np.uint8)
+        alpha = np.where(light, SPECK_LIGHT[1], SPECK_DARK[1]).astype(np.uint8)
+
+        speck_surf = pygame.Surface(size, pygame.SRCALPHA)
+        rgb = pygame.surfarray.pixels3d(speck_surf)
+        rgb[...] = np.where(covered, value, 0)[..., None]
+        del rgb
+        a = pygame.surfarray.pixels_alpha(speck_surf)
+        a[...] = np.where(covered, alpha, 0)
+        del a
+        surf.blit(speck_surf, (0, 0))
+
+    return surf
+
+def _clip_to_mask(surf, inside):
+    '''
+    zero every pixel outside the mask (what blitting the mask with BLEND_RGBA_MIN did)
+    '''
+    outside = ~inside
+    rgb = pygame.surfarray.pixels3d(surf)
+    rgb[outside] = 0
+    del rgb
+    a = pygame.surfarray.pixels_alpha(surf)
+    a[outside] = 0
+    del a
@@ -0,0 +1,78 @@
+from constants import POOL_LIMIT
+
+
+class EntityPool:
+    """
+    Free list of killed sprites of one class, so shot spam and split cascades
+    reuse old objects instead of building a new Sprite (and its dict, Vector2s
+    and group bookkeeping) every time.
+
+    acquire() hands back a pooled sprite reset in place with the same arguments
+    __init__ takes and put back in its class's containers, or a brand new one
+    when the pool is empty. Pooled.kill() gives dead sprites back.
+    """
+
+    def __init__(self, cls, limit: int = POOL_LIMIT):
+        self.cls = cls
+        self.limit = limit      # most dead sprites kept around, extras are left to the GC
+        self.free: list = []
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.dropped = 0
+
+    def acquire(self, *args, **kwargs):
+        if not self.free:
+            self.created += 1
+            return self.cls(*args, **kwargs)
+        obj = self.free.pop()
+        self.reused += 1
+        obj.reset(*args, **kwargs)
+        obj.add(*type(obj).containers)
+        return obj
+
+    def release(self, obj):
+        if len(self.free) < self.limit:
+            self.free.append(obj)
+            self.released += 1
+        else:
+            self.dropped += 1
+
+    def clear(self):
+        self.free.clear()
+
+    def stats(self) -> dict:
+        total = self.created + self.reused
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "free": len(self.free),
+            "dropped": self.dropped,
+            "reuse_rate": self.reused / total if total else 0.0,
+        }
+
+
+class Pooled:
+    """
+    Mixin for sprites that can come from an EntityPool. Set `pool` on the class
+    (same idea as `containers`/`store`), then create them with Cls.acquire(...)
+    instead of Cls(...). The class needs a reset() taking __init__'s arguments.
+    Without a pool acquire() is just the constructor.
+
+    A killed sprite can be handed straight back out by the next acquire(), so
+    read anything you still need from it before spawning more (see Asteroid.split).
+    """
+    pool = None
+
+    @classmethod
+    def acquire(cls, *args, **kwargs):
+        if cls.pool is None:
+            return cls(*args, **kwargs)
+        return cls.pool.acquire(*args, **kwargs)
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        pool = type(self).pool
+        if was_alive and pool is not None:
+            pool.release(self)
@@ -0,0 +1,241 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, sprites just move themselves without it
+    np = None
+
+
+class KinematicStore:
+    """
+    Structure-of-arrays storage for bodies that only drift and spin (asteroids, shots).
+    Every live body owns a slot in contiguous position/velocity/angle/spin arrays,
+    and step() moves all of them at once instead of one Vector2 update per sprite.
+    """
+
+    def __init__(self, world_w: float, world_h: float, capacity: int = 256):
+        if np is None:
+            raise ImportError("KinematicStore needs numpy")
+        self.world_w = world_w
+        self.world_h = world_h
+        self.generation = 0
+        self._alloc(capacity)
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    def _alloc(self, capacity: int):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.angle = np.zeros(capacity)
+        self.spin = np.zeros(capacity)
+        self.wrap = np.zeros(capacity, dtype=bool)
+        self.active = np.zeros(capacity, dtype=bool)
+        # last sim state, used to interpolate between sim steps when rendering
+        self.prev_pos = np.zeros((capacity, 2))
+        self.prev_angle = np.zeros(capacity)
+        self._live = None
+        self._free = list(range(capacity - 1, -1, -1))
+        self.top = 0            # one past the highest slot ever handed out
+        self.count = 0
+
+    def _grow(self):
+        old = (self.pos, self.vel, self.angle, self.spin, self.wrap, self.active, self.prev_pos, self.prev_angle)
+        old_cap, top, count = self.capacity, self.top, self.count
+        self._alloc(old_cap * 2)
+        new = (self.pos, self.vel, self.angle, self.spin, self.wrap, self.active, self.prev_pos, self.prev_angle)
+        for new_arr, old_arr in zip(new, old):
+            new_arr[:old_cap] = old_arr
+        # only called when every old slot is taken, so just the new ones are free
+        self._free = list(range(self.capacity - 1, old_cap - 1, -1))
+        self.top, self.count = top, count
+
+    def add(self, x, y, vx=0.0, vy=0.0, angle=0.0, spin=0.0, wrap=True) -> int:
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self.pos[slot] = (x, y)
+        self.prev_pos[slot] = (x, y)
+        self.vel[slot] = (vx, vy)
+        self.angle[slot] = angle
+        self.prev_angle[slot] = angle
+        self.spin[slot] = spin
+        self.wrap[slot] = wrap
+        self.active[slot] = True
+        self.top = max(self.top, slot + 1)
+        self.count += 1
+        return slot
+
+    def remove(self, slot: int):
+        if not self.active[slot]:
+            return
+        self.active[slot] = False
+        # zeroed velocity/spin means step() can run over dead slots without masking
+        self.vel[slot] = 0.0
+        self.spin[slot] = 0.0
+        self.count -= 1
+        self._free.append(slot)
+
+    def clear(self):
+        '''
+        drops every slot at once (used when the sprite groups get emptied on retry)
+        '''
+        self.generation += 1
+        self._alloc(self.capacity)
+
+    def snapshot(self):
+        '''
+        remember the current state as "previous", call right before a sim step
+        '''
+        n = self.top
+        self.prev_pos[:n] = self.pos[:n]
+        self.prev_angle[:n] = self.angle[:n]
+
+    def begin_render(self, alpha: float):
+        '''
+        temporarily swap in positions/angles blended between the last two sim states.
+        Deltas are taken the short way around the torus so nothing streaks across
+        the world when it wraps. Must be paired with end_render().
+        '''
+        n = self.top
+        self._live = (self.pos[:n].copy(), self.angle[:n].copy())
+        if n == 0:
+            return
+        delta = self.pos[:n] - self.prev_pos[:n]
+        wrap = self.wrap[:n]
+        for axis, size in ((0, self.world_w), (1, self.world_h)):
+            if size:
+                d = delta[:, axis]
+                short = (d + size * 0.5) % size - size * 0.5
+                d[wrap] = short[wrap]
+        self.pos[:n] = self.prev_pos[:n] + delta * alpha
+        self.angle[:n] = self.prev_angle[:n] + (self.angle[:n] - self.prev_angle[:n]) * alpha
+
+    def end_render(self):
+        if self._live is None:
+            return
+        pos, angle = self._live
+        n = len(angle)
+        self.pos[:n] = pos
+        self.angle[:n] = angle
+        self._live = None
+
+    def step(self, dt: float):
+        '''
+        advance every body by dt and wrap the ones that live on the torus
+        '''
+        n = self.top
+        if n == 0:
+            return
+        pos = self.pos[:n]
+        pos += self.vel[:n] * dt
+        self.angle[:n] += self.spin[:n] * dt
+
+        wrap = self.wrap[:n]
+        if self.world_w and self.world_h and wrap.any():
+            np.mod(pos[:, 0], self.world_w, out=pos[:, 0], where=wrap)
+            np.mod(pos[:, 1], self.world_h, out=pos[:, 1], where=wrap)
+
+
+class ArrayBody:
+    """
+    Mixin for CircleShape subclasses that can keep their kinematics in a KinematicStore.
+    Set `store` on the class (same idea as `containers`) to turn it on. Without a store
+    the sprite keeps its own Vector2s and everything works like before.
+
+    position/velocity hand out copies while attached, so always assign them
+    (`self.position += ...`) rather than mutating (`self.position.x = ...`).
+    """
+    store = None
+    store_wrap = True
+    _slot = None
+    _store = None
+    _angle = 0.0
+    _spin = 0.0
+
+    def _attach_store(self):
+        '''
+        call at the end of __init__, moves the values set so far into the store
+        '''
+        store = type(self).store
+        if store is None or self._slot is not None:
+            return
+        p, v = self._position, self._velocity
+        self._slot = store.add(p.x, p.y, v.x, v.y, self._angle, self._spin, wrap=self.store_wrap)
+        self._store = store
+        self._store_gen = store.generation
+
+    def _detach_store(self):
+        store, slot = self._store, self._slot
+        if slot is None:
+            return
+        if store.generation == self._store_gen:
+            # copy back so a killed sprite still knows where it was (split() needs this)
+            self._position = pygame.Vector2(store.pos[slot, 0], store.pos[slot, 1])
+            self._velocity = pygame.Vector2(store.vel[slot, 0], store.vel[slot, 1])
+            self._angle = float(store.angle[slot])
+            self._spin = float(store.spin[slot])
+            store.remove(slot)
+        self._slot = None
+        self._store = None
+
+    def kill(self):
+        self._detach_store()
+        super().kill()
+
+    @property
+    def position(self):
+        if self._slot is None:
+            return self._position
+        # indexing both coords is a lot quicker than unpacking the row
+        pos, slot = self._store.pos, self._slot
+        return pygame.Vector2(pos[slot, 0], pos[slot, 1])
+
+    @position.setter
+    def position(self, value):
+        if self._slot is None:
+            self._position = value if isinstance(value, pygame.Vector2) else pygame.Vector2(value)
+        else:
+            self._store.pos[self._slot] = (value[0], value[1])
+
+    @property
+    def velocity(self):
+        if self._slot is None:
+            return self._velocity
+        vel, slot = self._store.vel, self._slot
+        return pygame.Vector2(vel[slot, 0], vel[slot, 1])
+
+    @velocity.setter
+    def velocity(self, value):
+        if self._slot is None:
+            self._velocity = value if isinstance(value, pygame.Vector2) else pygame.Vector2(value)
+        else:
+            self._store.vel[self._slot] = (value[0], value[1])
+
+    @property
+    def angle(self):
+        if self._slot is None:
+            return self._angle
+        return float(self._store.angle[self._slot])
+
+    @angle.setter
+    def angle(self, value):
+        if self._slot is None:
+            self._angle = value
+        else:
+            self._store.angle[self._slot] = value
+
+    @property
+    def spin(self):
+        if self._slot is None:
+            return self._spin
+        return float(self._store.spin[self._slot])
+
+    @spin.setter
+    def spin(self, value):
+        if self._slot is None:
+            self._spin = value
+        else:
+            self._store.spin[self._slot] = value
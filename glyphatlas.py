@@ -0,0 +1,86 @@
+from collections import OrderedDict
+import pygame
+
+# what gets checked to decide if a font is monospaced
+_SAMPLE = "iW0:.( M"
+
+
+class GlyphFont:
+    """
+    Text drawing for HUD lines that get redrawn every frame.
+
+    Every character is rendered once per colour (the atlas) and strings are put
+    together by blitting glyphs at a fixed advance, which is exact for monospaced
+    fonts like PressStart2P. Whole strings are also kept in a small LRU, so
+    render() hands back the same Surface while the text stays the same.
+
+    render() works like pygame.font.Font.render so it can be passed anywhere a
+    font is. draw() blits straight onto the target and allocates nothing.
+    Proportional fonts still work, they just go through font.render per string.
+    """
+
+    def __init__(self, font: pygame.font.Font, max_strings: int = 128):
+        self.font = font
+        self.max_strings = max_strings
+        widths = {font.size(ch)[0] for ch in _SAMPLE}
+        self.monospace = len(widths) == 1 and font.size(_SAMPLE)[0] == len(_SAMPLE) * widths.pop()
+        self.advance = font.size(" ")[0]
+        self._glyphs: dict = {}                         # (char, antialias, color) -> Surface
+        self._strings: OrderedDict = OrderedDict()      # (text, antialias, color) -> Surface
+        self.hits = 0
+        self.misses = 0
+
+    def _glyph(self, ch, antialias, color):
+        key = (ch, antialias, color)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            glyph = self.font.render(ch, antialias, color)
+            self._glyphs[key] = glyph
+        return glyph
+
+    def size(self, text: str):
+        if self.monospace:
+            return len(text) * self.advance, self.font.get_height()
+        return self.font.size(text)
+
+    def render(self, text: str, antialias: bool, color, background=None) -> pygame.Surface:
+        if background is not None:
+            # not worth caching, nothing in the HUD uses it
+            return self.font.render(text, antialias, color, background)
+        color = tuple(pygame.Color(color))
+        key = (text, antialias, color)
+        surf = self._strings.get(key)
+        if surf is not None:
+            self._strings.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        if self.monospace:
+            surf = pygame.Surface(self.size(text), pygame.SRCALPHA)
+            self._blit_glyphs(surf, text, antialias, color, 0, 0)
+        else:
+            surf = self.font.render(text, antialias, color)
+        self._strings[key] = surf
+        if len(self._strings) > self.max_strings:
+            self._strings.popitem(last=False)
+        return surf
+
+    def _blit_glyphs(self, target, text, antialias, color, x, y):
+        adv = self.advance
+        target.blits([(self._glyph(ch, antialias, color), (x + i * adv, y)) for i, ch in enumerate(text) if ch != " "], doreturn=False)
+
+    def draw(self, target: pygame.Surface, text: str, color, antialias: bool = True, **anchor) -> pygame.Rect:
+        '''
+        draws text onto target, positioned by a Rect anchor keyword
+        (topleft=, center=, midtop=...). Returns the rect it covers
+        '''
+        rect = pygame.Rect((0, 0), self.size(text))
+        for name, value in (anchor or {"topleft": (0, 0)}).items():
+            setattr(rect, name, value)
+        color = tuple(pygame.Color(color))
+        if self.monospace:
+            self._blit_glyphs(target, text, antialias, color, rect.x, rect.y)
+        else:
+            target.blit(self.render(text, antialias, color), rect)
+        return rect
@@ -0,0 +1,356 @@
+"""
+Gym style wrapper around the Simulation, for training and evaluating bots.
+
+    env = AsteroidsEnv()
+    obs, info = env.reset(seed=1)
+    obs, reward, terminated, truncated, info = env.step(action)
+
+    vec = AsteroidsVecEnv(8, seed=1)         # 8 worker processes
+    obs, infos = vec.reset()
+    obs, rewards, terminated, truncated, infos = vec.step(actions)
+    vec.close()
+
+An action is a bitmask over GAME_KEYS (left, right, up, down, shoot), so 0-31,
+held for `frame_skip` sim ticks. Observations are flat float32 arrays, see
+AsteroidsEnv.observe(). No window, no audio, nothing gets drawn.
+"""
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import pygame
+from constants import *
+from camera import Camera
+from inputs import GAME_KEYS
+from replay import mask_to_keys
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional for the game, but observations are arrays
+    np = None
+
+N_ACTIONS = 1 << len(GAME_KEYS)
+PLAYER_FEATURES = 3         # sin/cos of the ship's heading, shot cooldown left
+ASTEROID_FEATURES = 6       # dx, dy, vx, vy, radius, present
+OBS_SIZE = PLAYER_FEATURES + ENV_OBS_ASTEROIDS * ASTEROID_FEATURES
+OBS_SPEED = 500.0           # velocities get divided by this
+
+
+def _init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if not pygame.get_init():
+        pygame.init()
+
+
+class ActionInput:
+    """
+    Input source for the Player that just returns whatever action the env set last
+    """
+    def __init__(self):
+        self.states = [mask_to_keys(a) for a in range(N_ACTIONS)]
+        self.action = 0
+
+    def __call__(self):
+        return self.states[self.action]
+
+
+class AsteroidsEnv:
+    """
+    One game behind reset()/step(). The Player, AsteroidField, collisions and
+    scoring are the Simulation's, stepped at SIM_DT with no clock.
+
+    Reward is the score gained during the step, minus ENV_DEATH_PENALTY when the
+    ship gets hit (which ends the episode). Episodes are cut off after max_steps.
+
+    The sprite classes are bound to one Simulation at a time, so it's one env
+    per process; AsteroidsVecEnv runs more of them in worker processes.
+    """
+
+    def __init__(self, *, cols: int = WORLD_COLS, rows: int = WORLD_ROWS, frame_skip: int = ENV_FRAME_SKIP,
+                 max_steps: int = ENV_MAX_STEPS, n_asteroids: int = ENV_OBS_ASTEROIDS):
+        if np is None:
+            raise ImportError("AsteroidsEnv needs numpy")
+        _init_pygame()
+        from simulation import Simulation
+        self.world_w = SCREEN_WIDTH * cols
+        self.world_h = SCREEN_HEIGHT * rows
+        self.frame_skip = max(1, frame_skip)
+        self.max_steps = max_steps
+        self.n_asteroids = n_asteroids
+        self.obs_size = PLAYER_FEATURES + n_asteroids * ASTEROID_FEATURES
+        self.n_actions = N_ACTIONS
+
+        self.cam = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, self.world_w, self.world_h, wrap=True)
+        self.cam.set_deadzone(int(SCREEN_WIDTH*0.25), int(SCREEN_HEIGHT*0.25))
+        self.input = ActionInput()
+        self.sim = Simulation(self.world_w, self.world_h, self.cam, input_source=self.input)
+        self.steps = 0
+        self.done = True
+
+    def reset(self, seed: int = None, out=None):
+        '''
+        start a new game, returns (observation, info). Same seed + same actions = same episode
+        '''
+        self.sim.reset(seed=seed)
+        self.input.action = 0
+        self.steps = 0
+        self.done = False
+        return self.observe(out), self.info()
+
+    def step(self, action: int, out=None):
+        '''
+        returns (observation, reward, terminated, truncated, info)
+        '''
+        if self.done:
+            raise RuntimeError("step() on a finished episode, call reset() first")
+        self.input.action = int(action) % N_ACTIONS
+        sim = self.sim
+        before = sim.score
+        hit = False
+        for _ in range(self.frame_skip):
+            if sim.step(SIM_DT):
+                hit = True
+                break
+        self.steps += 1
+        reward = float(sim.score - before)
+        if hit:
+            reward -= ENV_DEATH_PENALTY
+        truncated = not hit and self.steps >= self.max_steps
+        self.done = hit or truncated
+        return self.observe(out), reward, hit, truncated, self.info()
+
+    def info(self) -> dict:
+        sim = self.sim
+        return {"score": sim.score, "steps": self.steps, "asteroids": len(sim.asteroids), "seed": sim.seed}
+
+    def observe(self, out=None):
+        '''
+        float32 array of OBS_SIZE: the ship's heading (sin, cos) and cooldown, then
+        the n nearest asteroids measured around the torus, closest first, as
+        (dx, dy) in screens, (vx, vy) / OBS_SPEED, radius / ASTEROID_MAX_RADIUS and
+        a 1 in the last column. Rows past the last asteroid are all zero.
+        Writes into `out` when given (AsteroidsVecEnv points it at shared memory).
+        '''
+        if out is None:
+            out = np.zeros(self.obs_size, dtype=np.float32)
+        else:
+            out[:] = 0.0
+        player = self.sim.player
+        heading = np.radians(player.rotation)
+        out[0] = -np.sin(heading)      # forward is (0, 1) rotated by rotation
+        out[1] = np.cos(heading)
+        out[2] = max(0.0, player.timer) / PLAYER_COOL_DOWN
+
+        asteroids = self.sim.asteroids.sprites()
+        if not asteroids:
+            return out
+        state = self._asteroid_state(asteroids)
+        w, h = self.world_w, self.world_h
+        p = player.position
+        dx = (state[:, 0] - p.x + w * 0.5) % w - w * 0.5
+        dy = (state[:, 1] - p.y + h * 0.5) % h - h * 0.5
+        dist = dx * dx + dy * dy
+        k = min(self.n_asteroids, len(asteroids))
+        nearest = np.argpartition(dist, k - 1)[:k] if k < len(asteroids) else np.arange(k)
+        nearest = nearest[np.argsort(dist[nearest])]
+
+        rows = out[PLAYER_FEATURES:].reshape(self.n_asteroids, ASTEROID_FEATURES)
+        rows[:k, 0] = dx[nearest] / SCREEN_WIDTH
+        rows[:k, 1] = dy[nearest] / SCREEN_HEIGHT
+        rows[:k, 2] = state[nearest, 2] / OBS_SPEED
+        rows[:k, 3] = state[nearest, 3] / OBS_SPEED
+        rows[:k, 4] = state[nearest, 4] / ASTEROID_MAX_RADIUS
+        rows[:k, 5] = 1.0
+        return out
+
+    def _asteroid_state(self, asteroids):
+        # (x, y, vx, vy, radius) per asteroid, straight out of the KinematicStore when there is one
+        n = len(asteroids)
+        state = np.empty((n, 5))
+        rows, slots, store = [], [], None
+        for i, a in enumerate(asteroids):
+            if a._slot is not None:
+                rows.append(i)
+                slots.append(a._slot)
+                store = a._store
+            else:
+                if a.lod_dt:
+                    a.update(0.0)   # asleep in the LOD scheduler, catch it up first
+                p, v = a.position, a.velocity
+                state[i, :4] = (p.x, p.y, v.x, v.y)
+            state[i, 4] = a.radius
+        if rows:
+            state[rows, 0:2] = store.pos[slots]
+            state[rows, 2:4] = store.vel[slots]
+        return state
+
+    def close(self):
+        self.sim.clear()
+
+
+# --- vectorized ---
+
+def _worker(index, conn, names, n_envs, obs_size, env_kwargs):
+    '''
+    runs in a worker process: one AsteroidsEnv, driven by commands over the pipe.
+    Observations, actions, rewards and done flags all live in shared memory,
+    the pipe only carries the command and the info dict.
+    '''
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    obs = np.ndarray((n_envs, obs_size), dtype=np.float32, buffer=blocks[0].buf)[index]
+    actions = np.ndarray(n_envs, dtype=np.int32, buffer=blocks[1].buf)
+    rewards = np.ndarray(n_envs, dtype=np.float32, buffer=blocks[2].buf)
+    flags = np.ndarray((n_envs, 2), dtype=np.uint8, buffer=blocks[3].buf)
+    env = AsteroidsEnv(**env_kwargs)
+    try:
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == "reset":
+                _, info = env.reset(seed=arg, out=obs)
+                conn.send(info)
+            elif cmd == "step":
+                _, reward, terminated, truncated, info = env.step(actions[index], out=obs)
+                rewards[index] = reward
+                flags[index] = (terminated, truncated)
+                if terminated or truncated:
+                    # auto reset, the episode's last observation goes back in the info
+                    info["final_observation"] = obs.copy()
+                    env.reset(out=obs)
+                conn.send(info)
+            elif cmd == "close":
+                break
+    finally:
+        env.close()
+        del obs, actions, rewards, flags
+        for block in blocks:
+            block.close()
+        conn.close()
+
+
+class AsteroidsVecEnv:
+    """
+    n AsteroidsEnvs, one per worker process, stepped in lockstep.
+
+    Everything per step goes through shared memory: step() writes the actions
+    into a shared array, each worker steps its env and writes its observation
+    row, reward and done flags back in place, and the pipes only carry a tiny
+    "step" message each way (plus the info dicts). Finished episodes reset
+    themselves, with the last observation in info["final_observation"].
+
+    Workers are spawned, not forked, same as the BackgroundPool.
+    """
+
+    def __init__(self, n: int, *, seed: int = None, **env_kwargs):
+        if np is None:
+            raise ImportError("AsteroidsVecEnv needs numpy")
+        self.n = n
+        self.seed = seed
+        n_asteroids = env_kwargs.get("n_asteroids", ENV_OBS_ASTEROIDS)
+        self.obs_size = PLAYER_FEATURES + n_asteroids * ASTEROID_FEATURES
+        self.n_actions = N_ACTIONS
+
+        sizes = (n * self.obs_size * 4, n * 4, n * 4, n * 2)
+        self._blocks = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        names = [b.name for b in self._blocks]
+        self._obs = np.ndarray((n, self.obs_size), dtype=np.float32, buffer=self._blocks[0].buf)
+        self._actions = np.ndarray(n, dtype=np.int32, buffer=self._blocks[1].buf)
+        self._rewards = np.ndarray(n, dtype=np.float32, buffer=self._blocks[2].buf)
+        self._flags = np.ndarray((n, 2), dtype=np.uint8, buffer=self._blocks[3].buf)
+
+        ctx = mp.get_context("spawn")
+        self._conns = []
+        self._procs = []
+        for i in range(n):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker, args=(i, child, names, n, self.obs_size, env_kwargs), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+        self.closed = False
+
+    def reset(self, seed: int = None):
+        '''
+        reset every env, env i gets seed + i. Returns (observations, infos)
+        '''
+        seed = self.seed if seed is None else seed
+        for i, conn in enumerate(self._conns):
+            conn.send(("reset", None if seed is None else seed + i))
+        infos = [conn.recv() for conn in self._conns]
+        return self._obs.copy(), infos
+
+    def step(self, actions):
+        '''
+        one step in every env. Returns (observations, rewards, terminated, truncated, infos)
+        '''
+        self._actions[:] = actions
+        for conn in self._conns:
+            conn.send(("step", None))
+        infos = [conn.recv() for conn in self._conns]
+        flags = self._flags.astype(bool)
+        return self._obs.copy(), self._rewards.copy(), flags[:, 0], flags[:, 1], infos
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        # drop our views before the blocks go away
+        del self._obs, self._actions, self._rewards, self._flags
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Random-action rollouts through the gym env, reports throughput.")
+    parser.add_argument("--envs", type=int, default=1, help="how many envs, more than 1 runs them in worker processes")
+    parser.add_argument("--steps", type=int, default=2000, help="env steps per env")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    episodes = 0
+    if args.envs == 1:
+        env = AsteroidsEnv()
+        env.reset(seed=args.seed)
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            _, _, terminated, truncated, _ = env.step(rng.integers(N_ACTIONS))
+            if terminated or truncated:
+                episodes += 1
+                env.reset()
+        wall = time.perf_counter() - start
+        env.close()
+    else:
+        with AsteroidsVecEnv(args.envs, seed=args.seed) as vec:
+            vec.reset()
+            start = time.perf_counter()
+            for _ in range(args.steps):
+                _, _, terminated, truncated, _ = vec.step(rng.integers(N_ACTIONS, size=args.envs))
+                episodes += int((terminated | truncated).sum())
+            wall = time.perf_counter() - start
+    total = args.steps * args.envs
+    print(f"{total} env steps ({total * ENV_FRAME_SKIP} sim ticks) in {wall:.2f}s: "
+          f"{total / wall:.0f} steps/s, {episodes} episodes finished")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Run the game simulation with no window and no audio, as fast as the CPU allows.
+
+    python headless.py --minutes 30 --seed 1
+    python headless.py --minutes 5 --render          # also draw every frame offscreen
+    python headless.py --script inputs.json          # scripted instead of random input
+
+Reports how many simulated minutes we get per wall clock second, which is what
+we care about for soak testing long sessions.
+"""
+import os
+import argparse
+import random
+import time
+import pygame
+from constants import *
+from camera import Camera
+from simulation import Simulation
+from profiler import Profiler
+from inputs import RandomInput, ScriptedInput
+from replay import Recording, InputRecorder, ReplayInput
+from worldgrid import BackgroundGrid, make_tile
+from background import ParallaxBackground, _make_starfield, _make_nebula, _make_planet_overlay
+
+
+def init_headless():
+    '''
+    SDL dummy drivers have to be picked before pygame.init()
+    '''
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+    # a tiny dummy display is enough for convert()/convert_alpha() to work
+    return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+def run_headless(minutes: float = 10.0, *, seed=None, render: bool = False, input_source=None,
+                 rows: int = WORLD_ROWS, cols: int = WORLD_COLS, respawn: bool = True, report_every: float = 0.0,
+                 profiler=None, record=None, replay=None):
+    '''
+    Steps the Simulation for `minutes` of game time at SIM_DT with no frame cap.
+
+    Args:
+        minutes - simulated minutes to run
+        seed - seeds the global random module and the default random input
+        render - draw every frame to an offscreen surface (background, grid, sprites)
+        input_source - callable returning key state, defaults to RandomInput(seed)
+        rows, cols - world size in screens
+        respawn - start a new game when the player dies, otherwise stop
+        report_every - print a progress line every N simulated minutes (0 = off)
+        profiler - Profiler to time the sim (and render) phases with, per tick
+        record - path to save this run's seed and inputs to (one game, so no respawn)
+        replay - Recording to play back instead of generating input; its seed,
+                 world size and length override the arguments above
+
+    returns a dict of run stats
+    '''
+    screen = init_headless()
+    if seed is not None:
+        random.seed(seed)
+    if replay is not None:
+        input_source = ReplayInput(replay)
+        cols, rows = replay.cols, replay.rows
+        minutes = replay.ticks / replay.sim_hz / 60
+        respawn = False
+    if input_source is None:
+        input_source = RandomInput(seed)
+    recording = None
+    if record:
+        recording = Recording(0, sim_hz=SIM_HZ, cols=cols, rows=rows)
+        input_source = InputRecorder(recording, input_source)
+        respawn = False
+
+    world_w, world_h = SCREEN_WIDTH * cols, SCREEN_HEIGHT * rows
+    cam = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, world_w, world_h, wrap=True)
+    cam.set_deadzone(int(SCREEN_WIDTH*0.25), int(SCREEN_HEIGHT*0.25))
+
+    pbg = grid = None
+    if render:
+        pbg = ParallaxBackground(SCREEN_WIDTH, SCREEN_HEIGHT, seed=seed, make_starfield=_make_starfield, make_nebula=_make_nebula, make_planets=_make_planet_overlay, compact=True)
+        grid = BackgroundGrid(SCREEN_WIDTH, SCREEN_HEIGHT, make_tile_fn=make_tile, nrows=rows, ncols=cols)
+
+    prof = profiler if profiler is not None else Profiler(enabled=False)
+    sim = Simulation(world_w, world_h, cam, input_source=input_source, profiler=prof)
+    sim.reset(seed=replay.seed if replay is not None else None)
+    if recording is not None:
+        recording.seed = sim.seed
+
+    total_ticks = int(minutes * 60 * SIM_HZ)
+    report_ticks = int(report_every * 60 * SIM_HZ)
+    deaths = 0
+    despawned = 0
+    peak_asteroids = 0
+    best_score = 0
+    ticks = 0
+    start = time.perf_counter()
+
+    while ticks < total_ticks:
+        prof.begin_frame()
+        with prof.phase("sim"):
+            hit = sim.step(SIM_DT)
+        ticks += 1
+        peak_asteroids = max(peak_asteroids, len(sim.asteroids))
+
+        if render:
+            screen.fill((3, 4, 8))
+            pbg.begin_frame(cam.rect, wrap_w=world_w, wrap_h=world_h)
+            pbg.update(SIM_DT)
+            with prof.phase("draw_far"):
+                pbg.draw_far(screen, cam.rect)
+            with prof.phase("grid"):
+                grid.draw(screen, cam.rect, wrap=cam.wrap)
+            with prof.phase("draw_near"):
+                pbg.draw_near(screen, cam.rect)
+            with prof.phase("sprites"):
+                sim.draw(screen, cam.rect)
+        prof.count("asteroids", len(sim.asteroids))
+        prof.end_frame()
+
+        if hit:
+            deaths += 1
+            despawned += sim.field.despawned
+            best_score = max(best_score, sim.score)
+            if not respawn:
+                break
+            sim.reset()
+
+        if report_ticks and ticks % report_ticks == 0:
+            wall = time.perf_counter() - start
+            print(f"[{ticks / SIM_HZ / 60:6.1f} sim min] wall {wall:7.1f}s  asteroids {len(sim.asteroids):4d}  deaths {deaths}")
+
+    wall = time.perf_counter() - start
+    sim_seconds = ticks / SIM_HZ
+    best_score = max(best_score, sim.score)
+    result = {
+        "sim_seconds": sim_seconds,
+        "wall_seconds": wall,
+        "sim_minutes_per_wall_second": (sim_seconds / 60) / wall if wall > 0 else float("inf"),
+        "ticks": ticks,
+        "deaths": deaths,
+        "peak_asteroids": peak_asteroids,
+        "final_asteroids": len(sim.asteroids),
+        "despawned": despawned + sim.field.despawned,
+        "best_score": best_score,
+        "state_digest": sim.state_digest(),
+    }
+    for name, pool in sim.pool_stats().items():
+        result[f"{name.lower()}_pool_reuse_rate"] = pool["reuse_rate"]
+    if recording is not None:
+        recording.save(record)
+        result["recorded_ticks"] = recording.ticks
+    if render:
+        rc = sim.rotation_cache.stats()
+        result["rotation_cache_hit_rate"] = rc["hit_rate"]
+        result["rotation_cache_bytes"] = rc["bytes"]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the asteroids simulation headless and uncapped.")
+    parser.add_argument("--minutes", type=float, default=10.0, help="simulated minutes to run")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--render", action="store_true", help="draw every frame offscreen too")
+    parser.add_argument("--script", default=None, help="JSON list of [ticks, [keys]] steps instead of random input")
+    parser.add_argument("--no-respawn", action="store_true", help="stop at the first death")
+    parser.add_argument("--rows", type=int, default=WORLD_ROWS)
+    parser.add_argument("--cols", type=int, default=WORLD_COLS)
+    parser.add_argument("--report-every", type=float, default=1.0, help="progress line every N sim minutes, 0 = quiet")
+    parser.add_argument("--record", default=None, help="save the run's seed + per-tick inputs here (stops at first death)")
+    parser.add_argument("--replay", default=None, help="re-run a recording made here or in the game (--record)")
+    parser.add_argument("--trace", default=None, help="profile every tick and write a Chrome trace json here")
+    args = parser.parse_args()
+
+    input_source = None
+    if args.script:
+        input_source = ScriptedInput.from_file(args.script)
+
+    profiler = None
+    if args.trace:
+        profiler = Profiler(enabled=True)
+        profiler.start_trace()
+
+    result = run_headless(args.minutes, seed=args.seed, render=args.render, input_source=input_source,
+                          rows=args.rows, cols=args.cols, respawn=not args.no_respawn, report_every=args.report_every,
+                          profiler=profiler, record=args.record,
+                          replay=Recording.load(args.replay) if args.replay else None)
+    for k, v in result.items():
+        print(f"{k}: {v:.3f}" if isinstance(v, float) else f"{k}: {v}")
+
+    if profiler is not None:
+        for name, pct in sorted(profiler.summary().items()):
+            print(f"  {name:<24} p50 {pct['p50']:7.3f} ms  p99 {pct['p99']:7.3f} ms")
+        print("trace written to", profiler.stop_trace(args.trace))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import json
+import random
+import pygame
+
+# the keys Player.update actually looks at
+GAME_KEYS = {
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+    "up": pygame.K_UP,
+    "down": pygame.K_DOWN,
+    "shoot": pygame.K_LSHIFT,
+}
+
+class KeyState:
+    """
+    Stand-in for pygame.key.get_pressed(), anything not held reads as False
+    """
+    def __init__(self, held=()):
+        self.held = set(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+class RandomInput:
+    """
+    Mashes buttons for the headless runner. Holds each combo for a random number
+    of ticks so it plays a bit more like a person than pure per-tick noise.
+    """
+    def __init__(self, seed=None, min_hold: int = 5, max_hold: int = 40, shoot_chance: float = 0.6):
+        self.rng = random.Random(seed)
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.shoot_chance = shoot_chance
+        self._ticks_left = 0
+        self._state = KeyState()
+
+    def __call__(self) -> KeyState:
+        if self._ticks_left <= 0:
+            held = []
+            turn = self.rng.choice((None, "left", "right"))
+            if turn:
+                held.append(GAME_KEYS[turn])
+            if self.rng.random() < 0.7:
+                held.append(GAME_KEYS["up"])
+            if self.rng.random() < self.shoot_chance:
+                held.append(GAME_KEYS["shoot"])
+            self._state = KeyState(held)
+            self._ticks_left = self.rng.randint(self.min_hold, self.max_hold)
+        self._ticks_left -= 1
+        return self._state
+
+class ScriptedInput:
+    """
+    Plays back a list of (ticks, [key names]) steps, looping when it runs out.
+    Key names are the ones in GAME_KEYS.
+    """
+    def __init__(self, steps, loop: bool = True):
+        self.steps = [(int(ticks), KeyState(GAME_KEYS[k] for k in keys)) for ticks, keys in steps if int(ticks) > 0]
+        self.loop = loop
+        self._i = 0
+        self._ticks_left = self.steps[0][0] if self.steps else 0
+
+    @classmethod
+    def from_file(cls, path: str, loop: bool = True):
+        '''
+        loads a JSON list like [[30, ["up"]], [10, ["left", "shoot"]]]
+        '''
+        with open(path) as f:
+            return cls(json.load(f), loop=loop)
+
+    def __call__(self) -> KeyState:
+        while self._ticks_left <= 0:
+            if self._i + 1 >= len(self.steps):
+                if not self.loop or not self.steps:
+                    return KeyState()
+                self._i = -1
+            self._i += 1
+            self._ticks_left = self.steps[self._i][0]
+        self._ticks_left -= 1
+        return self.steps[self._i][1]
@@ -0,0 +1,153 @@
+from constants import LOD_SECTOR_W, LOD_SECTOR_H, LOD_MARGIN, LOD_INTERVAL, LOD_MIN_ASTEROIDS
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, every sprite gets looked up one at a time without it
+    np = None
+
+
+class LODScheduler:
+    """
+    Sector based level of detail for asteroids.
+
+    The world gets cut into sectors (a quarter screen each by default). Every
+    sim step mark() flags the sectors that matter: the ones within `margin` of
+    the camera view, plus the ring around every shot and the player. Asteroids
+    in a flagged sector are awake, everything else sleeps.
+
+    Sleeping asteroids:
+      - only get update() every `interval` steps, staggered by lod_phase so they
+        don't all come due on the same tick. The time they skipped piles up in
+        lod_dt and Asteroid.update adds it on, and since asteroids only drift and
+        spin a catch-up step lands exactly where the small steps would have.
+      - are left out of the collision grid. Nothing can hit them there: shots die
+        90px outside the view and the sector ring is wider than a shot's reach
+        plus how far an asteroid can drift in `interval` steps.
+
+    Asteroids in the KinematicStore keep moving in the vectorized step either
+    way, for them sleeping skips the update() call and the collision grid.
+
+    With fewer than `min_population` asteroids the bookkeeping costs more than
+    it saves, so everything just counts as awake.
+    """
+
+    def __init__(self, world_w: float, world_h: float, *, sector_w: float = LOD_SECTOR_W, sector_h: float = LOD_SECTOR_H,
+                 margin: float = LOD_MARGIN, interval: int = LOD_INTERVAL, min_population: int = LOD_MIN_ASTEROIDS, enabled: bool = True):
+        self.world_w = world_w
+        self.world_h = world_h
+        # whole number of sectors across the world so they wrap cleanly (same as SpatialHash)
+        self.cols = max(1, int(world_w // sector_w))
+        self.rows = max(1, int(world_h // sector_h))
+        self.sector_w = world_w / self.cols
+        self.sector_h = world_h / self.rows
+        self.margin = margin
+        self.interval = max(1, interval)
+        self.enabled = enabled
+        self.min_population = min_population
+        self.active = False     # enabled and enough asteroids around to bother, set by begin_step
+        self.tick = 0
+        self.sectors = bytearray(self.cols * self.rows)    # 1 = awake
+        self.awake = 0          # asteroids awake / asleep on the last due()
+        self.asleep = 0
+        self._store_awake = None
+
+    def _sector(self, x: float, y: float) -> int:
+        cx = int(x // self.sector_w) % self.cols
+        cy = int(y // self.sector_h) % self.rows
+        return cy * self.cols + cx
+
+    def _mark_rect(self, x0, y0, x1, y1):
+        sectors, cols, rows = self.sectors, self.cols, self.rows
+        cx0, cy0 = int(x0 // self.sector_w), int(y0 // self.sector_h)
+        ncx = min(cols, int(x1 // self.sector_w) - cx0 + 1)
+        ncy = min(rows, int(y1 // self.sector_h) - cy0 + 1)
+        for j in range(ncy):
+            row = ((cy0 + j) % rows) * cols
+            for i in range(ncx):
+                sectors[row + (cx0 + i) % cols] = 1
+
+    def mark(self, cam_rect, movers=(), store=None):
+        '''
+        flag the awake sectors for this point in the step. movers are the sprites
+        that can hit asteroids (shots, the player), each wakes the ring of sectors
+        around it. With a store the flags get looked up for every slot in one go.
+        '''
+        self.sectors[:] = bytes(len(self.sectors))
+        m = self.margin
+        self._mark_rect(cam_rect.left - m, cam_rect.top - m, cam_rect.right + m, cam_rect.bottom + m)
+
+        cols, rows = self.cols, self.rows
+        seen = set()
+        for sprite in movers:
+            p = sprite.position
+            seen.add((int(p.x // self.sector_w), int(p.y // self.sector_h)))
+        sectors = self.sectors
+        for cx, cy in seen:
+            for j in (cy - 1, cy, cy + 1):
+                row = (j % rows) * cols
+                for i in (cx - 1, cx, cx + 1):
+                    sectors[row + i % cols] = 1
+
+        self._store_awake = None
+        if store is not None and np is not None and store.top:
+            n = store.top
+            cx = (store.pos[:n, 0] // self.sector_w).astype(np.intp) % cols
+            cy = (store.pos[:n, 1] // self.sector_h).astype(np.intp) % rows
+            grid = np.frombuffer(sectors, dtype=np.uint8)
+            self._store_awake = grid[cy * cols + cx].astype(bool).tolist()
+
+    def is_awake(self, sprite) -> bool:
+        slot = sprite._slot
+        if slot is not None and self._store_awake is not None and slot < len(self._store_awake):
+            return self._store_awake[slot]
+        p = sprite.position
+        return bool(self.sectors[self._sector(p.x, p.y)])
+
+    def begin_step(self, cam_rect, movers=(), store=None, population: int = 0):
+        self.tick += 1
+        # switching off is safe: due() hands every sleeper its update (and lod_dt) on this step
+        self.active = self.enabled and population >= self.min_population
+        if self.active:
+            self.mark(cam_rect, movers, store)
+
+    def due(self, sprites, dt: float) -> list:
+        '''
+        the sprites to update this step, in order. Sleeping ones that aren't due
+        get dt added to their lod_dt instead
+        '''
+        if not self.active:
+            self.awake, self.asleep = 0, 0
+            return list(sprites)
+        out = []
+        awake = asleep = 0
+        interval, tick = self.interval, self.tick
+        for sprite in sprites:
+            if not getattr(sprite, "lod", False):
+                out.append(sprite)
+            elif self.is_awake(sprite):
+                awake += 1
+                out.append(sprite)
+            else:
+                asleep += 1
+                if (sprite.lod_phase + tick) % interval == 0:
+                    out.append(sprite)
+                else:
+                    sprite.lod_dt += dt
+        self.awake, self.asleep = awake, asleep
+        return out
+
+    def collidable(self, sprites) -> list:
+        '''
+        the asteroids worth putting in the collision grid: the awake ones, caught
+        up first if they were asleep until now. Call mark() again before this
+        once everything has moved.
+        '''
+        if not self.active:
+            return list(sprites)
+        out = []
+        for sprite in sprites:
+            if self.is_awake(sprite):
+                if sprite.lod_dt:
+                    sprite.update(0.0)
+                out.append(sprite)
+        return out
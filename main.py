@@ -1,204 +1,206 @@
 import pygame
 from constants import *
-from player import Player, Shot
-from asteroid import Asteroid, get_velocity_color
-from asteroidfield import AsteroidField
 from menus import *
-from stats import GameStats
-from objectives import Objective
 import os
 from worldgrid import *
 from camera import Camera
+from simulation import Simulation
+from timestep import FixedTimestep, RenderInterpolator
 from menu_bg import MenuBackground
 from background import ParallaxBackground, _make_starfield, _make_nebula, _make_planet_overlay
-
-def main():
+from bgpool import BackgroundPool
+from assetcache import AssetCache
+from glyphatlas import GlyphFont
+from audio import AudioEngine
+from profiler import Profiler, ProfilerOverlay
+from replay import Recording, InputRecorder
+import argparse
+import time
+import random
+
+def main(record=None):
     os.environ["SDL_AUDIODRIVER"] = "pulse"
     os.environ["PULSE_LATENCY_MSEC"] = "200"
 
     pygame.mixer.pre_init(frequency=44100, size=-16,channels=1,buffer=2048)
     pygame.init()
 
-    game_stats = GameStats()
     clock = pygame.time.Clock()
     dt = 0
-    score = 0
-
-    updateable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-    objectives = pygame.sprite.Group()
-
-    Asteroid.containers = (asteroids, updateable, drawable)
-    Player.containers = (updateable, drawable)
-    AsteroidField.containers = (updateable,)
-    Shot.containers = (shots, updateable, drawable)
-    Objective.containers = (updateable, drawable, objectives)
     
     font = pygame.font.Font("assets/fonts/PressStart2P-Regular.ttf", 20)
     big_font = pygame.font.Font("assets/fonts/Orbitron-Black.ttf", 96)
+    # HUD text is redrawn every frame, build it from cached glyphs
+    hud_font = GlyphFont(font)
+    # F3 shows the frame profiler, F4 starts/stops writing a trace file
+    profiler = Profiler(enabled=False)
+    prof_overlay = ProfilerOverlay(profiler, GlyphFont(pygame.font.Font("assets/fonts/PressStart2P-Regular.ttf", 10)))
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     begin_wait = True
 
-    music = pygame.mixer.Sound("assets/new_music.wav")
-    music.set_volume(0.3)
-    music.play(loops=-1)
-    muted = False
-
-    pbg = ParallaxBackground(SCREEN_WIDTH, SCREEN_HEIGHT, seed=None, make_starfield=_make_starfield, make_nebula=_make_nebula, make_planets=_make_planet_overlay)
-    
-    menu_bg = MenuBackground(SCREEN_WIDTH, SCREEN_HEIGHT, seed=None, n_asteroids=10, planets=True)
-    grid = BackgroundGrid(SCREEN_WIDTH, SCREEN_HEIGHT, make_tile_fn=make_tile, nrows=5, ncols=5)
+    audio = AudioEngine()
+    audio.load("shot", "assets/shot_sound.wav", volume=SHOT_VOLUME, max_voices=6, priority=1)
+    audio.play_music("assets/new_music.wav")
+
+    # menu backdrop goes first since it's needed first, the parallax layers
+    # keep building in the pool while the menu is up
+    # one of a fixed set of seeds, so after the first few launches they all come off disk
+    bg_pool = BackgroundPool()
+    bg_cache = AssetCache()
+    bg_seed = random.randrange(BACKGROUND_SEEDS)
+    menu_bg = MenuBackground(SCREEN_WIDTH, SCREEN_HEIGHT, seed=bg_seed, n_asteroids=10, planets=True, pool=bg_pool, cache=bg_cache)
+    pbg = ParallaxBackground(SCREEN_WIDTH, SCREEN_HEIGHT, seed=bg_seed, make_starfield=_make_starfield, make_nebula=_make_nebula, make_planets=_make_planet_overlay, pool=bg_pool, cache=bg_cache, compact=True)
+    bg_pool.close()
+
+    grid = BackgroundGrid(SCREEN_WIDTH, SCREEN_HEIGHT, make_tile_fn=make_tile, nrows=WORLD_ROWS, ncols=WORLD_COLS)
     world_w, world_h = grid.world_w, grid.world_h
 
     cam = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, world_w, world_h, wrap=True)
     cam.set_deadzone(int(SCREEN_WIDTH*0.25), int(SCREEN_HEIGHT*0.25))
-    
+
+    # with --record every game's seed and per-tick keys get saved, replay with headless.py --replay
+    recorder = InputRecorder(None) if record else None
+    sim = Simulation(world_w, world_h, cam, audio=audio, profiler=profiler, input_source=recorder)
+    stepper = FixedTimestep()
+    interp = RenderInterpolator(world_w, world_h, store=sim.store, cam=cam)
+    game_snapshot = screen.copy()
+    games = 0
+
+    def start_game():
+        nonlocal games
+        sim.reset()
+        stepper.reset()
+        games += 1
+        if recorder is not None:
+            recorder.recording = Recording(sim.seed, sim_hz=SIM_HZ, cols=WORLD_COLS, rows=WORLD_ROWS)
+
+    def save_recording():
+        if recorder is None or recorder.recording is None:
+            return
+        stem, ext = os.path.splitext(record)
+        path = record if games == 1 else f"{stem}-{games}{ext}"
+        recorder.recording.save(path)
+        print(f"recorded {recorder.recording.ticks} ticks to {path}")
+        recorder.recording = None
+
     while True:
         
         while begin_wait:
             start = draw_main_menu(screen, font, big_font, menu_bg, clock)
             if not start:
                 return
-            score = 0
-            game_stats = GameStats()
-            player = Player(world_w/2, world_h/2, world_w=world_w, world_h=world_h, wrap_world=True, muted=muted, fill_alpha=200, game_stats=game_stats, cam=cam)
-            field = AsteroidField(world_w=world_w, world_h=world_h, cam=cam, wrap_world=True)
+            start_game()
             begin_wait = False
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                save_recording()
                 return
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_m:
-                    muted = not muted
-                    if muted:
-                        music.set_volume(0.0)
-                        player.muted = muted
+                    audio.toggle_mute()
+                if event.key == pygame.K_F3:
+                    prof_overlay.visible = not prof_overlay.visible
+                    profiler.enabled = prof_overlay.visible or profiler.tracing
+                if event.key == pygame.K_F4:
+                    if profiler.tracing:
+                        print("profile trace written to", profiler.stop_trace(time.strftime("trace-%Y%m%d-%H%M%S.json")))
+                        profiler.enabled = prof_overlay.visible
                     else:
-                        music.set_volume(0.3)
-                        player.muted = muted
+                        profiler.enabled = True
+                        profiler.start_trace()
             
         #screen.fill((0,0,0))
         #screen.blit(background, (0, 0))
        
-        cam.push_follow(player.position.x, player.position.y)
-        updateable.update(dt)
-
+        profiler.begin_frame()
+        frame_start = time.perf_counter()
+
+        # fixed rate sim, however long the last frame took
+        player_hit = False
+        with profiler.phase("sim"):
+            for _ in range(stepper.advance(dt)):
+                interp.snapshot(sim.updateable)
+                if sim.step(SIM_DT):
+                    player_hit = True
+                    break
+
+        player = sim.player
+        interp.begin(sim.updateable, stepper.alpha)
         screen.fill((3, 4, 8))
         pbg.begin_frame(cam.rect, wrap_w=world_w, wrap_h=world_h)
         pbg.update(dt)
-        pbg.draw_far(screen, cam.rect)
-        grid.draw(screen, cam.rect, wrap=cam.wrap)
-        pbg.draw_near(screen, cam.rect)
- 
-        for sprite in drawable:
-            try: 
-                sprite.draw(screen, cam.rect)
-            except TypeError:
-                sprite.draw(screen)
-
-        game_snapshot = screen.copy()
-        draw_hud(screen, font, score, game_stats.stats["Stars_collected"])
-        cols = world_w // SCREEN_WIDTH
-        rows = world_h // SCREEN_HEIGHT
-        tile_x = int(player.position.x // SCREEN_WIDTH) % cols
-        tile_y = int(player.position.y // SCREEN_HEIGHT) % rows
-        tile_y_disp = (rows - 1) - tile_y
-        offset_x = int(player.position.x % SCREEN_WIDTH)
-        offset_y = int(player.position.y % SCREEN_HEIGHT)
-        offset_y_disp = SCREEN_HEIGHT - 1 - offset_y
-        sector_line = f"Sector: ({tile_x}, {tile_y_disp})"
-        coord_line = f"Local: ({offset_x}, {offset_y_disp})"
-        coord_surf = font.render(coord_line, True, "white")
-        coord_rect = coord_surf.get_rect(topleft=(20, SCREEN_HEIGHT - 40))
-        sector_surf = font.render(sector_line, True, "white")
-        sector_rect = sector_surf.get_rect(bottomleft=(coord_rect.left, coord_rect.top -2))
-        screen.blit(coord_surf, coord_rect)
-        screen.blit(sector_surf, sector_rect)
-
-        for objective in objectives:
-            if player.collision(objective):
-                objective.kill()
-                if objective.type == ObjectiveType.STAR:
-                    game_stats.increment_stat("Stars_collected")
-                    score += 2000
-
-                
-
-        for asteroid in asteroids:
-            if player.collision(asteroid):
-                action = draw_game_over_menu(screen, font, big_font, score, menu_bg, clock, game_snapshot)
-                if action == 'quit':
+        with profiler.phase("draw_far"):
+            pbg.draw_far(screen, cam.rect)
+        with profiler.phase("grid"):
+            grid.draw(screen, cam.rect, wrap=cam.wrap)
+        with profiler.phase("draw_near"):
+            pbg.draw_near(screen, cam.rect)
+
+        with profiler.phase("sprites"):
+            sim.draw(screen, cam.rect)
+
+        interp.end()
+
+        with profiler.phase("snapshot"):
+            game_snapshot = screen.copy()
+        with profiler.phase("hud"):
+            draw_hud(screen, hud_font, sim.score, sim.game_stats.stats["Stars_collected"])
+            cols = world_w // SCREEN_WIDTH
+            rows = world_h // SCREEN_HEIGHT
+            tile_x = int(player.position.x // SCREEN_WIDTH) % cols
+            tile_y = int(player.position.y // SCREEN_HEIGHT) % rows
+            tile_y_disp = (rows - 1) - tile_y
+            offset_x = int(player.position.x % SCREEN_WIDTH)
+            offset_y = int(player.position.y % SCREEN_HEIGHT)
+            offset_y_disp = SCREEN_HEIGHT - 1 - offset_y
+            sector_line = f"Sector: ({tile_x}, {tile_y_disp})"
+            coord_line = f"Local: ({offset_x}, {offset_y_disp})"
+            coord_rect = hud_font.draw(screen, coord_line, "white", topleft=(20, SCREEN_HEIGHT - 40))
+            hud_font.draw(screen, sector_line, "white", bottomleft=(coord_rect.left, coord_rect.top -2))
+
+        profiler.count("asteroids", len(sim.asteroids))
+        profiler.count("shots", len(sim.shots))
+        profiler.count("objectives", len(sim.objectives))
+        profiler.count("budget", sim.field.effective_budget())
+        # sprites built from scratch so far, should stop climbing once the pools are warm
+        profiler.count("new", sum(p["created"] for p in sim.pool_stats().values()))
+        prof_overlay.draw(screen)
+
+        if player_hit:
+            save_recording()
+            action = draw_game_over_menu(screen, font, big_font, sim.score, menu_bg, clock, game_snapshot)
+            if action == 'quit':
+                return
+            elif action == 'retry':
+                start_game()
+
+            elif action == 'main_menu':
+                sim.clear()
+                begin_wait = True
+            elif action == 'stats':
+                sim.clear()
+                stat_action = draw_stats_menu(screen, font, big_font, sim.game_stats, menu_bg, clock, game_snapshot)
+                if stat_action == 'quit':
                     return
-                elif action == 'retry':
-                    score = 0
-                    game_stats = GameStats()
-                    for g in (updateable, drawable, asteroids, shots, objectives):
-                        g.empty()
-                    player = Player(world_w/2, world_h/2, world_w=world_w, world_h=world_h, wrap_world=True, muted=muted, fill_alpha=200, game_stats=game_stats, cam=cam)
-                    field = AsteroidField(world_w=world_w, world_h=world_h, cam=cam, wrap_world=True)
-                    
-                elif action == 'main_menu':
-                    for g in (updateable, drawable, asteroids, shots, objectives):
-                        g.empty()
+                elif stat_action == 'main_menu':
+                    sim.clear()
                     begin_wait = True
-                elif action == 'stats':
-                    for g in (updateable, drawable, asteroids, shots, objectives):
-                        g.empty()
-                    stat_action = draw_stats_menu(screen, font, big_font, game_stats, menu_bg, clock, game_snapshot)
-                    if stat_action == 'quit':
-                        return
-                    elif stat_action == 'main_menu':
-                        for g in (updateable, drawable, asteroids, shots, objectives):
-                            g.empty()
-                        begin_wait = True
-                    elif stat_action == 'retry':
-                        score = 0
-                        game_stats = GameStats()
-                        for g in (updateable, drawable, asteroids, shots, objectives):
-                            g.empty()
-                        player = Player(world_w/2, world_h/2, world_w=world_w, world_h=world_h, wrap_world=True, muted=muted, fill_alpha=200, game_stats=game_stats, cam=cam)
-                        field = AsteroidField(world_w=world_w, world_h=world_h, cam=cam, wrap_world=True)
-                        
-           
-            for shot in shots:
-                if shot.collision(asteroid):
-                    shot.kill()
-                    asteroid_color = get_velocity_color(asteroid.velocity)
-                    if asteroid_color == (25, 38, 56):
-                        game_stats.increment_stat("Level0_asteroids_destroyed")
-                        score += 50
-                    elif asteroid_color == (64, 119, 142):
-                        game_stats.increment_stat("Level1_asteroids_destroyed")
-                        score += 100
-                    elif asteroid_color == (108, 66, 133):
-                        game_stats.increment_stat("Level2_asteroids_destroyed")
-                        score += 200
-                    elif asteroid_color == (196, 107, 44):
-                        game_stats.increment_stat("Level3_asteroids_destroyed")
-                        score += 250
-                        new_star = Objective(world_w/2, world_h/2, 20,world_w=world_w, world_h=world_h, cam=cam,obj_type=ObjectiveType.STAR)
-                        new_star.spawn_in_view(margin=24)
-                    elif asteroid_color == (178, 40, 85):
-                        game_stats.increment_stat("Level4_asteroids_destroyed")
-                        score += 350
-                        new_star = Objective(world_w/2, world_h/2, 20,world_w=world_w, world_h=world_h, cam=cam,obj_type=ObjectiveType.STAR)
-                        new_star.spawn_in_view(margin=24)
-                        #print(f"{bonus.position}")
-                    elif asteroid_color == (0, 222, 173):
-                        game_stats.increment_stat("Level5_asteroids_destroyed")
-                        score += 500
-                        new_star = Objective(world_w/2, world_h/2, 20,world_w=world_w, world_h=world_h, cam=cam,obj_type=ObjectiveType.STAR)
-                        new_star.spawn_in_view(margin=24)
-                        #print(f"{bonus.position}")
-                    #score += asteroid.thick + int(asteroid.velocity.length())
-                    asteroid.split()
-        
-        pygame.display.flip()
+                elif stat_action == 'retry':
+                    start_game()
+
+        # slow frames make the field spawn fewer asteroids. Wall clock time would
+        # make a recorded game impossible to replay, so not while recording
+        if recorder is None and not player_hit:
+            sim.field.report_frame_cost(time.perf_counter() - frame_start)
+
+        with profiler.phase("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
 
         dt = clock.tick(60)/1000
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Asteroids")
+    parser.add_argument("--record", default=None, help="save each game's seed + inputs here for headless.py --replay")
+    main(record=parser.parse_args().record)
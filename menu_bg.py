@@ -1,6 +1,7 @@
 import random
 import pygame
 from background import create_space_background
+from bgpool import run_inline
 
 class MenuAsteroid():
     def __init__(self, w, h, rng):
@@ -66,14 +67,25 @@ class MenuAsteroid():
         pygame.draw.polygon(screen, (200, 220, 255), cam_pts, 1)
 
 class MenuBackground:
-    def __init__(self, width, height, *, seed = None, n_asteroids = 8, planets = True):
+    def __init__(self, width, height, *, seed = None, n_asteroids = 8, planets = True, pool = None, cache = None):
         self.w, self.h = width, height
-        self.base = create_space_background(width, height, seed=seed, planets=planets)
-        if self.base.get_alpha() is not None:
-            self.base = self.base.convert()
+        # may be building in a BackgroundPool worker, picked up on first draw
+        submit = pool.submit if pool is not None else run_inline
+        if cache is not None and seed is not None:
+            submit = cache.wrap(submit)
+        self._base_job = submit(create_space_background, width, height, seed=seed, planets=planets)
+        self._base = None
         self._rng = random.Random(seed)
         self.asteroids = [MenuAsteroid(width, height, self._rng) for _ in range(n_asteroids)]
 
+    @property
+    def base(self):
+        if self._base is None:
+            # worker output comes back as a raw frombuffer surface, get it into display format
+            self._base = self._base_job.result().convert()
+            self._base_job = None
+        return self._base
+
     def update(self,dt):
         for a in self.asteroids:
             a.update(dt)
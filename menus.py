@@ -1,5 +1,5 @@
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, MENU_IDLE_FPS
 import re
 
 FONTCOLORS = {
@@ -45,6 +45,37 @@ def render_text_with_outline(text, font, text_color, outline_color=(0, 0, 0), th
     out.blit(base, (thickness, thickness))
     return out
 
+def run_static_menu(screen, clock, frame, actions):
+    """
+    Input loop for a menu that doesn't change while it's up.
+    The finished frame is pushed once, after that the display is only touched
+    again if the window needs repainting, and the loop idles at MENU_IDLE_FPS.
+
+    Args:
+        frame: fully composited menu surface
+        actions: {key: action} for the keys that close the menu
+
+    Returns:
+        the action for the key pressed, or 'quit' if the window is closed
+    """
+    screen.blit(frame, (0, 0))
+    pygame.display.update()
+    while True:
+        clock.tick(MENU_IDLE_FPS)
+        dirty = []
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return 'quit'
+            if event.type == pygame.KEYDOWN and event.key in actions:
+                return actions[event.key]
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                dirty.append(screen.get_rect())
+
+        if dirty:
+            for rect in dirty:
+                screen.blit(frame, rect, rect)
+            pygame.display.update(dirty)
+
 def draw_main_menu(screen, font, big_font, menu_bg, clock):
     """
     Draw the main menu screen with start game and quit options.
@@ -100,62 +131,48 @@ def draw_game_over_menu(screen, font, big_font, score, menu_bg, clock, game_snap
     Returns:
         str: Action to take - 'retry', 'quit', or 'main_menu'
     """
+    # everything on this screen is static, so put it together once
+    frame = game_snapshot.copy()
     overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
     overlay.fill((120, 15, 15, 150))
-    # Handle input
-    while True:
-        dt = clock.tick(60) / 1000
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return 'quit'
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    return 'quit'
-                if event.key == pygame.K_r:
-                    return 'retry'
-                if event.key == pygame.K_ESCAPE:
-                    return 'main_menu'
-                if event.key == pygame.K_s:
-                    return 'stats'
-                
-        screen.blit(game_snapshot, (0,0))
-        screen.blit(overlay, (0,0))
-        #menu_bg.draw(screen)
-                
-            
-        # Game over title
-        end_game = render_text_with_outline("GAME OVER", big_font, FONTCOLORS["title_game_over"], outline_color=(20,0,0), thickness=3)
-        #end_game = big_font.render("GAME OVER", True, FONTCOLORS["title_game_over"])
-        end_rect = end_game.get_rect(center=(SCREEN_WIDTH//2, 80))
-        screen.blit(end_game, end_rect)
-        
-        # Score display
-        score_text = render_text_with_shadow(f"Final Score: {score}",font,FONTCOLORS["score"],shadow_color=(0,0,0), offset=(2,2), shadow_alpha=150)
-        #score_text = font.render(f"Final Score: {score}", True, FONTCOLORS["score"])
-        score_rect = score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 80))
-        screen.blit(score_text, score_rect)
-        
-        # Stats menu
-        stats = font.render("Press S for Stats", True, FONTCOLORS["stats"])
-        stats_rect = stats.get_rect(center=(SCREEN_WIDTH//2, 500))
-        screen.blit(stats, stats_rect)
-
-        # Retry option
-        restart = font.render("Press R to Retry", True, FONTCOLORS["retry"])
-        restart_rect = restart.get_rect(center=(SCREEN_WIDTH//2, 560))
-        screen.blit(restart, restart_rect)
-        
-        # Quit option
-        game_quit = font.render("Press Q to Quit", True, FONTCOLORS["quit"])
-        quit_rect = game_quit.get_rect(center=(SCREEN_WIDTH//2, 620))
-        screen.blit(game_quit, quit_rect)
-        
-        # Main menu option
-        main_menu = font.render("Press ESC to go to Main Menu", True, FONTCOLORS["menu_quit"])
-        menu_rect = main_menu.get_rect(center=(SCREEN_WIDTH//2, 680))
-        screen.blit(main_menu, menu_rect)
-        
-        pygame.display.flip()
+    frame.blit(overlay, (0,0))
+
+    # Game over title
+    end_game = render_text_with_outline("GAME OVER", big_font, FONTCOLORS["title_game_over"], outline_color=(20,0,0), thickness=3)
+    end_rect = end_game.get_rect(center=(SCREEN_WIDTH//2, 80))
+    frame.blit(end_game, end_rect)
+
+    # Score display
+    score_text = render_text_with_shadow(f"Final Score: {score}",font,FONTCOLORS["score"],shadow_color=(0,0,0), offset=(2,2), shadow_alpha=150)
+    score_rect = score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 80))
+    frame.blit(score_text, score_rect)
+
+    # Stats menu
+    stats = font.render("Press S for Stats", True, FONTCOLORS["stats"])
+    stats_rect = stats.get_rect(center=(SCREEN_WIDTH//2, 500))
+    frame.blit(stats, stats_rect)
+
+    # Retry option
+    restart = font.render("Press R to Retry", True, FONTCOLORS["retry"])
+    restart_rect = restart.get_rect(center=(SCREEN_WIDTH//2, 560))
+    frame.blit(restart, restart_rect)
+
+    # Quit option
+    game_quit = font.render("Press Q to Quit", True, FONTCOLORS["quit"])
+    quit_rect = game_quit.get_rect(center=(SCREEN_WIDTH//2, 620))
+    frame.blit(game_quit, quit_rect)
+
+    # Main menu option
+    main_menu = font.render("Press ESC to go to Main Menu", True, FONTCOLORS["menu_quit"])
+    menu_rect = main_menu.get_rect(center=(SCREEN_WIDTH//2, 680))
+    frame.blit(main_menu, menu_rect)
+
+    return run_static_menu(screen, clock, frame, {
+        pygame.K_q: 'quit',
+        pygame.K_r: 'retry',
+        pygame.K_ESCAPE: 'main_menu',
+        pygame.K_s: 'stats',
+    })
 
 def draw_hud(screen, font, score, collected):
     """
@@ -187,82 +204,71 @@ def draw_stats_menu(screen, font, big_font, game_stats, menu_bg, clock, game_sna
         big_font: main text
         game_stats: GameStats object
     """
+    # everything on this screen is static, so put it together once
+    frame = game_snapshot.copy()
     overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
     overlay.fill((120, 15, 15, 150))
+    frame.blit(overlay, (0,0))
 
-    #Handle input
-    while True:
-        dt = clock.tick(60)/1000
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return 'quit'
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    return 'quit'
-                if event.key == pygame.K_ESCAPE:
-                    return 'main_menu'
-                if event.key == pygame.K_r:
-                    return 'retry'
-                
-        screen.blit(game_snapshot, (0,0))
-        screen.blit(overlay, (0,0,))
-
-                
-        #Title
-        title = big_font.render("Game Statistics", True, FONTCOLORS["title_stats"])
-        title_rect = title.get_rect(center=(SCREEN_WIDTH//2, 80))
-        screen.blit(title, title_rect)
-
-        #Display stats
-        y_offset = 150
-        line_spacing = 40
-
-        #Get all stats
-        game_stats.accuracy()
-        for stat_name, value in game_stats.stats.items():
-            if value == 0:
-                continue
-            
-            if "red" in stat_name.lower():
-                color = "red"
-            elif "blue" in stat_name.lower():
-                color = "blue"
-            elif "green" in stat_name.lower():
-                color = "green"
-            elif "yellow" in stat_name.lower():
-                color = "yellow"
-            elif "orange" in stat_name.lower():
-                color = "orange"
-            else:
-                color = "white"
-
-            display_name = stat_name.replace("_", " ").title()
-            display_name = re.sub("Level(\d+)", r"Level \1", display_name)
-
-            if "accuracy" in stat_name:
-                display_value = f"{value:.1f}%"
-            else:
-                display_value = str(value)
-
-            stat_text = font.render(f"{display_name}: {display_value}", True, FONTCOLORS["stats"])
-            stat_rect = stat_text.get_rect(topleft=(title_rect.left, y_offset))
-            screen.blit(stat_text, stat_rect)
-
-            y_offset += line_spacing
-
-        # Retry option
-        restart = font.render("Press R to Retry", True, FONTCOLORS["retry"])
-        restart_rect = restart.get_rect(center=(SCREEN_WIDTH//2, 560))
-        screen.blit(restart, restart_rect)
-        
-        # Main menu option
-        back_text = font.render("Press ESC to go to Main Menu", True, FONTCOLORS["menu_quit"])
-        back_rect = back_text.get_rect(center=(SCREEN_WIDTH//2, 680))
-        screen.blit(back_text, back_rect)
-
-        # Quit option
-        game_quit = font.render("Press Q to Quit", True, FONTCOLORS["quit"])
-        quit_rect = game_quit.get_rect(center=(SCREEN_WIDTH//2, 620))
-        screen.blit(game_quit, quit_rect)
+    #Title
+    title = big_font.render("Game Statistics", True, FONTCOLORS["title_stats"])
+    title_rect = title.get_rect(center=(SCREEN_WIDTH//2, 80))
+    frame.blit(title, title_rect)
+
+    #Display stats
+    y_offset = 150
+    line_spacing = 40
+
+    #Get all stats
+    game_stats.accuracy()
+    for stat_name, value in game_stats.stats.items():
+        if value == 0:
+            continue
+
+        if "red" in stat_name.lower():
+            color = "red"
+        elif "blue" in stat_name.lower():
+            color = "blue"
+        elif "green" in stat_name.lower():
+            color = "green"
+        elif "yellow" in stat_name.lower():
+            color = "yellow"
+        elif "orange" in stat_name.lower():
+            color = "orange"
+        else:
+            color = "white"
+
+        display_name = stat_name.replace("_", " ").title()
+        display_name = re.sub(r"Level(\d+)", r"Level \1", display_name)
+
+        if "accuracy" in stat_name:
+            display_value = f"{value:.1f}%"
+        else:
+            display_value = str(value)
+
+        stat_text = font.render(f"{display_name}: {display_value}", True, FONTCOLORS["stats"])
+        stat_rect = stat_text.get_rect(topleft=(title_rect.left, y_offset))
+        frame.blit(stat_text, stat_rect)
+
+        y_offset += line_spacing
+
+    # Retry option
+    restart = font.render("Press R to Retry", True, FONTCOLORS["retry"])
+    restart_rect = restart.get_rect(center=(SCREEN_WIDTH//2, 560))
+    frame.blit(restart, restart_rect)
+
+    # Main menu option
+    back_text = font.render("Press ESC to go to Main Menu", True, FONTCOLORS["menu_quit"])
+    back_rect = back_text.get_rect(center=(SCREEN_WIDTH//2, 680))
+    frame.blit(back_text, back_rect)
+
+    # Quit option
+    game_quit = font.render("Press Q to Quit", True, FONTCOLORS["quit"])
+    quit_rect = game_quit.get_rect(center=(SCREEN_WIDTH//2, 620))
+    frame.blit(game_quit, quit_rect)
 
-        pygame.display.flip()
\ No newline at end of file
+    return run_static_menu(screen, clock, frame, {
+        pygame.K_q: 'quit',
+        pygame.K_ESCAPE: 'main_menu',
+        pygame.K_r: 'retry',
+    })
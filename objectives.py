@@ -3,10 +3,24 @@ from circleshape import CircleShape
 import random
 from constants import *
 from wrapdraw import wrap_offsets
+from torus import sprite_offsets
+from entitypool import Pooled
+
+class Objective(Pooled, CircleShape):
+    rng = random    # spawn spots, the Simulation gives it a seeded stream
 
-class Objective(CircleShape):
     def __init__(self, x, y, radius, fill_alpha=200, obj_type=None,*, world_w=None, world_h=None,cam=None, wrap_world=True):
         super().__init__(x, y, radius)
+        self.reset(x, y, radius, fill_alpha, obj_type, world_w=world_w, world_h=world_h, cam=cam, wrap_world=wrap_world)
+
+    def reset(self, x, y, radius, fill_alpha=200, obj_type=None, *, world_w=None, world_h=None, cam=None, wrap_world=True):
+        '''
+        (re)initialise in place, __init__ and the star pool both go through here
+        '''
+        self.position = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(0, 0)
+        self.radius = radius
+        self._local_pts = None
         self.fill_alpha = fill_alpha
         self.type = obj_type
         self.world_w = world_w
@@ -17,6 +31,8 @@ class Objective(CircleShape):
             self.make_star()
 
     def _is_visible(self, cam_rect: pygame.Rect) -> bool:
+        if self.torus is not None:
+            return self.torus.visible(self.position.x, self.position.y, self.radius)
         r = self.radius
         bounding_rect = pygame.Rect(self.position.x - r, self.position.y - r, 2*r, 2*r)
         offs = wrap_offsets(bounding_rect, cam_rect, int(self.world_w or 0), int(self.world_h or 0))
@@ -82,7 +98,7 @@ class Objective(CircleShape):
         self.type = ObjectiveType.STAR
 
     def draw_star(self, screen, cam_rect = None):
-        if not hasattr(self, '_local_pts'):
+        if self._local_pts is None:
             return
 
         diameter = int(self.radius * 2)
@@ -99,9 +115,7 @@ class Objective(CircleShape):
             screen.blit(star_surface, (int(blit_x), int(blit_y)))
             return
 
-        r = self.radius
-        bounding_rect = pygame.Rect(self.position.x - r, self.position.y - r, 2*r, 2*r)
-        for ox, oy in wrap_offsets(bounding_rect, cam_rect, self.world_w, self.world_h):
+        for ox, oy in sprite_offsets(self, cam_rect):
             blit_x = self.position.x + ox - self.radius - cam_rect.left
             blit_y = self.position.y + oy - self.radius - cam_rect.top
             screen.blit(star_surface, (int(blit_x), int(blit_y)))
@@ -112,11 +126,11 @@ class Objective(CircleShape):
         self.velocity = pygame.Vector2(0, 0)
         if self.world_w and self.world_h:
             self.position = pygame.Vector2(
-                random.randint(0, int(self.world_w)),
-                random.randint(0, int(self.world_h))
+                self.rng.randint(0, int(self.world_w)),
+                self.rng.randint(0, int(self.world_h))
             )
         else:
-            self.position = pygame.Vector2(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT))
+            self.position = pygame.Vector2(self.rng.randint(0, SCREEN_WIDTH), self.rng.randint(0, SCREEN_HEIGHT))
 
     def spawn_in_view(self, margin: int=20):
         """
@@ -140,8 +154,8 @@ class Objective(CircleShape):
         if right < left:   left, right = cam_rect.left + r, cam_rect.right - r
         if bottom < top:   top, bottom = cam_rect.top + r, cam_rect.bottom - r
 
-        x = random.uniform(left, right)
-        y = random.uniform(top, bottom)
+        x = self.rng.uniform(left, right)
+        y = self.rng.uniform(top, bottom)
 
         # Wrap into world to be safe
         if self.world_w and self.world_h and self.wrap_world:
@@ -3,22 +3,27 @@ import pygame
 from circleshape import CircleShape
 from constants import *
 from wrapdraw import *
+from torus import sprite_offsets
+from entitystore import ArrayBody
+from entitypool import Pooled
 
 class Player(CircleShape):
-    
-    def __init__(self, x, y, *, world_w, world_h, wrap_world=True, muted=False, fill_alpha=200, game_stats=None, cam=None):
+    audio = None    # AudioEngine, set by the Simulation. None plays nothing
+
+    def __init__(self, x, y, *, world_w, world_h, wrap_world=True, fill_alpha=200, game_stats=None, cam=None, input_source=None):
         super().__init__(x, y, PLAYER_RADIUS)
         self.rotation = 0
         self.timer = 0.0
         self.too_many_keys = False
         self.fill_alpha = fill_alpha
-        self.muted = muted
         self.game_stats = game_stats
 
         self.world_w = world_w
         self.world_h = world_h
         self.wrap_world = wrap_world
         self.cam = cam
+        # anything that returns an indexable key state, live keyboard by default
+        self.input_source = input_source or pygame.key.get_pressed
 
     def triangle(self):
         forward = pygame.Vector2(0, 1).rotate(self.rotation)
@@ -29,14 +34,10 @@ class Player(CircleShape):
         return [a, b, c]
     
     def draw(self, screen, cam_rect):
-        r = self.radius
-        bounding_rect = pygame.Rect(self.position.x - r, self.position.y - r, 2*r, 2*r)
-
         union_rect = None
-        for ox, oy in wrap_offsets(bounding_rect, cam_rect, self.world_w, self.world_h):
-            pts = [self.position + pygame.Vector2(p).rotate(0) for p in ()]
-            pts = self.triangle()
-            pts = [(p.x + ox - cam_rect.left, p.y + oy - cam_rect.top) for p in pts]
+        triangle = self.triangle()
+        for ox, oy in sprite_offsets(self, cam_rect):
+            pts = [(p.x + ox - cam_rect.left, p.y + oy - cam_rect.top) for p in triangle]
             last_rect = pygame.draw.polygon(screen, (255, 255, 255, self.fill_alpha), pts)
             union_rect = last_rect if union_rect is None else union_rect.union(last_rect)
 
@@ -59,7 +60,7 @@ class Player(CircleShape):
                 self.input_queue.remove(event.key)
 
     def update(self, dt):
-        keys = pygame.key.get_pressed()
+        keys = self.input_source()
         #self.shot_release = True
         movement_count = sum([
             keys[pygame.K_LEFT],
@@ -98,24 +99,34 @@ class Player(CircleShape):
             self.position.y = max(0, min(self.position.y, self.world_h))
 
     def shoot(self):
-        shot = Shot(self.position.x, self.position.y, SHOT_RADIUS, cam = self.cam, world_w = self.world_w, world_h=self.world_h)
+        shot = Shot.acquire(self.position.x, self.position.y, SHOT_RADIUS, cam = self.cam, world_w = self.world_w, world_h=self.world_h)
         shot.velocity = pygame.Vector2(0, 1).rotate(self.rotation) * PLAYER_SHOOT_SPEED
-        if not self.muted:
-            shot_sound = pygame.mixer.Sound("assets/shot_sound.wav")
-            shot_sound.set_volume(0.1)
-            shot_sound.play()
+        if self.audio is not None:
+            self.audio.play("shot")
 
         if self.game_stats:
             self.game_stats.increment_stat("shots_fired")
 
 
-class Shot(CircleShape):
+class Shot(Pooled, ArrayBody, CircleShape):
     def __init__(self, x, y, radius, *, cam=None, world_w=None, world_h=None):
         super().__init__(x, y, SHOT_RADIUS)
+        self.reset(x, y, radius, cam=cam, world_w=world_w, world_h=world_h)
+
+    def reset(self, x, y, radius, *, cam=None, world_w=None, world_h=None):
+        '''
+        (re)initialise in place, __init__ and the shot pool both go through here
+        '''
+        self.position = (x, y)
+        self.velocity = (0, 0)
+        self.radius = SHOT_RADIUS
         self.cam = cam
         self.world_w = world_w
         self.world_h = world_h
         self.age = 0.0
+        # shots only wrap in the store when there is a world to wrap around
+        self.store_wrap = bool(world_w and world_h)
+        self._attach_store()
 
     def _is_visible(self, buffer: int = 60) -> bool:
         if self.cam is None or self.world_w is None or self.world_h is None:
@@ -123,13 +134,20 @@ class Shot(CircleShape):
             return (0 - buffer <= self.position.x - r <= SCREEN_WIDTH + buffer and
                     0 - buffer <= self.position.y - r <= SCREEN_HEIGHT + buffer)
 
+        if self.torus is not None:
+            p = self.position
+            return self.torus.visible(p.x, p.y, self.radius, buffer)
         cam_rect = self.cam.rect.inflate(buffer*2, buffer*2)
         r = self.radius
         bounding_rect = pygame.Rect(self.position.x - r, self.position.y - r, 2*r, 2*r)
         return len(wrap_offsets(bounding_rect, cam_rect, self.world_w, self.world_h)) > 0
 
     def draw(self, screen, cam_rect):
-        if self.cam and self.world_w and self.world_h:
+        if self.cam and self.world_w and self.world_h and self.torus is not None:
+            p = self.position
+            for ox, oy in self.torus.offsets_of(self):
+                pygame.draw.circle(screen, "white", (int(p.x + ox - cam_rect.left), int(p.y + oy - cam_rect.top)), self.radius, 2)
+        elif self.cam and self.world_w and self.world_h:
             for p in screen_positions_wrapped(self.position, cam_rect, self.world_w, self.world_h, self.radius + 2):
                 pygame.draw.circle(screen, "white", (int(p.x), int(p.y)), self.radius, 2)
         else:
@@ -138,11 +156,18 @@ class Shot(CircleShape):
 
     def update(self, dt):
         self.age += dt
-        self.position += self.velocity * dt
+        if self._slot is None:
+            self.position += self.velocity * dt
         buffer = 90
         if self.cam and self.world_w and self.world_h:
             if self.age > 0.05:
-                if not is_on_screen_wrapped(self.position, self.cam.rect, self.world_w, self.world_h, self.radius, buffer):
+                p = self.position
+                if self.torus is not None:
+                    # centre within buffer of the view, same test as is_on_screen_wrapped
+                    on_screen = self.torus.visible(p.x, p.y, 0, buffer)
+                else:
+                    on_screen = is_on_screen_wrapped(p, self.cam.rect, self.world_w, self.world_h, self.radius, buffer)
+                if not on_screen:
                     self.kill()
 
         else:
@@ -0,0 +1,112 @@
+import struct
+from inputs import GAME_KEYS, KeyState
+
+# file layout (little endian):
+#   header  magic "ASTREP", version u8, sim hz u16, world cols u8, rows u8, seed i64, ticks u32, runs u32
+#   body    `runs` x (key mask u8, run length u16)
+# key mask bits follow GAME_KEYS order. Held keys tend to stay held, so
+# run length encoding keeps a long session down to a few KB.
+MAGIC = b"ASTREP"
+VERSION = 1
+_HEADER = struct.Struct("<6sBHBBqII")
+_RUN = struct.Struct("<BH")
+_KEY_BITS = list(GAME_KEYS.values())
+
+
+def keys_to_mask(pressed) -> int:
+    mask = 0
+    for bit, key in enumerate(_KEY_BITS):
+        if pressed[key]:
+            mask |= 1 << bit
+    return mask
+
+def mask_to_keys(mask: int) -> KeyState:
+    return KeyState(key for bit, key in enumerate(_KEY_BITS) if mask & (1 << bit))
+
+
+class Recording:
+    """
+    Everything needed to re-run one game: the seed the Simulation was reset with,
+    the world it ran in, and the key state the player read on every sim tick.
+    """
+    def __init__(self, seed: int, *, sim_hz: int, cols: int, rows: int, masks=None):
+        self.seed = seed
+        self.sim_hz = sim_hz
+        self.cols = cols
+        self.rows = rows
+        self.masks = bytearray(masks or ())
+
+    @property
+    def ticks(self) -> int:
+        return len(self.masks)
+
+    def save(self, path: str):
+        runs = []
+        for m in self.masks:
+            if runs and runs[-1][0] == m and runs[-1][1] < 0xFFFF:
+                runs[-1][1] += 1
+            else:
+                runs.append([m, 1])
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.sim_hz, self.cols, self.rows, self.seed, len(self.masks), len(runs)))
+            f.write(b"".join(_RUN.pack(m, n) for m, n in runs))
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, sim_hz, cols, rows, seed, ticks, n_runs = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} isn't a replay file")
+        if version != VERSION:
+            raise ValueError(f"{path} is replay version {version}, this build reads {VERSION}")
+        masks = bytearray()
+        for i in range(n_runs):
+            m, n = _RUN.unpack_from(data, _HEADER.size + i * _RUN.size)
+            masks += bytes((m,)) * n
+        if len(masks) != ticks:
+            raise ValueError(f"{path} is truncated ({len(masks)} of {ticks} ticks)")
+        return cls(seed, sim_hz=sim_hz, cols=cols, rows=rows, masks=masks)
+
+
+class InputRecorder:
+    """
+    Wraps an input source (the live keyboard by default) and logs what it returns
+    each tick. It hands the player the decoded mask rather than the raw state, so
+    the recorded game and its replay see exactly the same keys.
+    recording can be swapped out (or None) between games.
+    """
+    def __init__(self, recording, source=None):
+        import pygame
+        self.recording = recording
+        self.source = source or pygame.key.get_pressed
+
+    def __call__(self) -> KeyState:
+        mask = keys_to_mask(self.source())
+        if self.recording is not None:
+            self.recording.masks.append(mask)
+        return mask_to_keys(mask)
+
+
+class ReplayInput:
+    """
+    Input source that plays a Recording back one tick per call, then nothing.
+    """
+    def __init__(self, recording: Recording):
+        self.recording = recording
+        self.tick = 0
+        self._states = {}
+
+    @property
+    def finished(self) -> bool:
+        return self.tick >= self.recording.ticks
+
+    def __call__(self) -> KeyState:
+        if self.finished:
+            return KeyState()
+        mask = self.recording.masks[self.tick]
+        self.tick += 1
+        state = self._states.get(mask)
+        if state is None:
+            state = self._states[mask] = mask_to_keys(mask)
+        return state
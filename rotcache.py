@@ -0,0 +1,68 @@
+from collections import OrderedDict
+import pygame
+from constants import ROTATION_BUCKETS, ROTATION_CACHE_BYTES
+
+
+class RotationCache:
+    """
+    LRU cache of pre-rotated overlay surfaces keyed by (template, angle bucket).
+    Angles get snapped to one of `buckets` steps around the circle, so a spinning
+    asteroid reuses the same handful of rotated surfaces instead of calling
+    pygame.transform.rotate (and allocating) every frame.
+    Oldest entries get dropped once the cached surfaces go over `max_bytes`.
+    """
+
+    def __init__(self, buckets: int = ROTATION_BUCKETS, max_bytes: int = ROTATION_CACHE_BYTES):
+        self.buckets = max(1, int(buckets))
+        self.step = 360.0 / self.buckets
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bucket(self, angle: float) -> int:
+        return int(round((angle % 360.0) / self.step)) % self.buckets
+
+    def get(self, template: pygame.Surface, angle: float) -> pygame.Surface:
+        '''
+        template rotated by angle (snapped to the nearest bucket)
+        '''
+        b = self.bucket(angle)
+        key = (id(template), b)
+        entry = self._entries.get(key)
+        # the entry keeps the template alive, so its id can't get reused while cached
+        if entry is not None and entry[0] is template:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        rotated = pygame.transform.rotate(template, b * self.step)
+        size = rotated.get_bytesize() * rotated.get_width() * rotated.get_height()
+        if entry is not None:
+            self.bytes -= entry[2]
+        self._entries[key] = (template, rotated, size)
+        self._entries.move_to_end(key)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, old_size) = self._entries.popitem(last=False)
+            self.bytes -= old_size
+            self.evictions += 1
+        return rotated
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
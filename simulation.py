@@ -0,0 +1,241 @@
+import random
+import hashlib
+import pygame
+from typing import NamedTuple
+from constants import *
+from player import Player, Shot
+from asteroid import Asteroid, ASTEROID_TIERS
+from asteroidfield import AsteroidField
+from stats import GameStats
+from objectives import Objective
+from spatialhash import SpatialHash
+from entitystore import KinematicStore
+from entitypool import EntityPool
+from circleshape import CircleShape
+from torus import TorusView
+from lod import LODScheduler
+from detailatlas import DetailAtlas
+from rotcache import RotationCache
+from profiler import Profiler
+
+
+class KillEvent(NamedTuple):
+    tier: int               # index into ASTEROID_TIERS
+    x: float
+    y: float
+    radius: float
+
+
+class Simulation:
+    """
+    One game of asteroids without any of the window/menu stuff:
+    sprite groups, player, asteroid field, collisions and scoring.
+    main.py drives it off the real clock, headless.py runs it as fast as it can.
+    """
+
+    def __init__(self, world_w: int, world_h: int, cam, *, audio=None, input_source=None, use_store: bool = True, atlas=None, profiler=None, use_pools: bool = True, use_lod: bool = True):
+        self.world_w = world_w
+        self.world_h = world_h
+        self.cam = cam
+        self.audio = audio      # AudioEngine, None runs silent
+        self.profiler = profiler if profiler is not None else Profiler(enabled=False)
+        self.input_source = input_source
+
+        self.updateable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+        self.objectives = pygame.sprite.Group()
+
+        # asteroids and shots move in one vectorized step when numpy is around
+        self.store = KinematicStore(world_w, world_h) if use_store and KinematicStore.available() else None
+
+        # killed shots/asteroids/stars get reset and reused instead of rebuilt
+        self.pools = {cls.__name__: EntityPool(cls) for cls in (Shot, Asteroid, Objective)} if use_pools else {}
+
+        # shapes/overlays get built once up front instead of on every spawn and split
+        self.atlas = atlas if atlas is not None else DetailAtlas(seed=ASTEROID_ATLAS_SEED)
+        self.rotation_cache = RotationCache()
+
+        # where the camera sits on the torus, shared by every sprite's wrap/visibility checks
+        self.torus = TorusView(world_w, world_h)
+
+        # asteroids far from the camera only get updated every few steps
+        self.lod = LODScheduler(world_w, world_h, enabled=use_lod)
+
+        # broadphase grids, rebuilt every sim step so collision checks only look at neighbours
+        self.asteroid_hash = SpatialHash(world_w, world_h, wrap=True)
+        self.objective_hash = SpatialHash(world_w, world_h, wrap=True)
+
+        self.seed = None
+        self.score = 0
+        self.game_stats = GameStats()
+        self.player = None
+        self.field = None
+        self.kills: list[KillEvent] = []    # asteroids destroyed during the last step
+        self.drawn = 0          # sprites drawn / skipped as off camera in the last draw()
+        self.culled = 0
+        self.bind()
+
+    def bind(self):
+        '''
+        point the sprite classes at this sim's groups/store.
+        These are class attributes, so only one Simulation can be live at a time.
+        '''
+        Asteroid.containers = (self.asteroids, self.updateable, self.drawable)
+        Player.containers = (self.updateable, self.drawable)
+        AsteroidField.containers = (self.updateable,)
+        Shot.containers = (self.shots, self.updateable, self.drawable)
+        Objective.containers = (self.updateable, self.drawable, self.objectives)
+        Asteroid.store = self.store
+        Shot.store = self.store
+        for cls in (Shot, Asteroid, Objective):
+            cls.pool = self.pools.get(cls.__name__)
+        Asteroid.atlas = self.atlas
+        Asteroid.rotation_cache = self.rotation_cache
+        Player.audio = self.audio
+        CircleShape.torus = self.torus
+
+    def seed_streams(self, seed: int):
+        '''
+        every subsystem draws from its own stream derived from seed, so a game
+        replays exactly and one subsystem drawing more numbers doesn't shift the others
+        '''
+        self.seed = seed
+        Asteroid.rng = random.Random(f"{seed}:asteroid")
+        AsteroidField.rng = random.Random(f"{seed}:field")
+        Objective.rng = random.Random(f"{seed}:objective")
+
+    def clear(self):
+        # kill() rather than just emptying the groups, so everything goes back to the pools
+        for sprite in self.updateable.sprites():
+            sprite.kill()
+        for g in (self.updateable, self.drawable, self.asteroids, self.shots, self.objectives):
+            g.empty()
+        if self.store is not None:
+            self.store.clear()
+
+    def reset(self, seed: int = None):
+        '''
+        start a fresh game: empty world, new stats, player in the middle.
+        Same seed + same inputs each tick = same game
+        '''
+        self.bind()
+        self.clear()
+        self.seed_streams(seed if seed is not None else random.randrange(2**63))
+        self.score = 0
+        self.game_stats = GameStats()
+        w, h = self.world_w, self.world_h
+        self.player = Player(w/2, h/2, world_w=w, world_h=h, wrap_world=True, fill_alpha=200, game_stats=self.game_stats, cam=self.cam, input_source=self.input_source)
+        self.field = AsteroidField(world_w=w, world_h=h, cam=self.cam, wrap_world=True, asteroids=self.asteroids)
+        # same camera start every game, or a replay would spawn asteroids somewhere else
+        self.cam.center_on(w/2, h/2)
+        self.torus.update(self.cam.rect)
+
+    def pool_stats(self) -> dict:
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    def state_digest(self) -> str:
+        '''
+        short hash of the game state, two runs that match here played out the same
+        '''
+        h = hashlib.sha1()
+        h.update(repr((self.score, round(self.player.position.x, 3), round(self.player.position.y, 3))).encode())
+        for a in self.asteroids:
+            if a.lod_dt:
+                a.update(0.0)   # catch up sleeping asteroids so LOD doesn't change the digest
+            p, v = a.position, a.velocity
+            h.update(repr((a.radius, round(p.x, 3), round(p.y, 3), round(v.x, 3), round(v.y, 3))).encode())
+        return h.hexdigest()[:16]
+
+    def step(self, dt: float) -> bool:
+        '''
+        advance one sim step, returns True if the player got hit
+        '''
+        prof = self.profiler
+        self.cam.push_follow(self.player.position.x, self.player.position.y)
+        self.torus.update(self.cam.rect)
+        if self.store is not None:
+            with prof.phase("store"):
+                self.store.step(dt)
+        with prof.phase("update"):
+            self.lod.begin_step(self.cam.rect, self._movers(), self.store, len(self.asteroids))
+            prof.update_group(self.lod.due(self.updateable, dt), dt)
+            prof.count("asleep", self.lod.asleep)
+        with prof.phase("collisions"):
+            return self.resolve_collisions()
+
+    def draw(self, screen, cam_rect):
+        '''
+        draw the sprites the camera can see. One batched pass over the whole
+        world picks them out and works out their wrap offsets, so the draw
+        calls only scale with what's on screen
+        '''
+        prof = self.profiler
+        with prof.phase("visibility"):
+            self.torus.update(cam_rect)
+            visible = self.torus.prepare(self.drawable)
+        self.drawn = len(visible)
+        self.culled = len(self.drawable) - self.drawn
+        prof.count("drawn", self.drawn)
+        prof.count("culled", self.culled)
+        prof.draw_group(visible, screen, cam_rect)
+
+    def apply_kills(self, kills):
+        '''
+        score, stats and star drops for a batch of destroyed asteroids, all driven by ASTEROID_TIERS
+        '''
+        if not kills:
+            return
+        stars = 0
+        for kill in kills:
+            tier = ASTEROID_TIERS[kill.tier]
+            self.game_stats.increment_stat(tier.stat)
+            self.score += tier.score
+            stars += tier.drops_star
+
+        w, h = self.world_w, self.world_h
+        for _ in range(stars):
+            new_star = Objective.acquire(w/2, h/2, 20, world_w=w, world_h=h, cam=self.cam, obj_type=ObjectiveType.STAR)
+            new_star.spawn_in_view(margin=24)
+
+    def _movers(self):
+        '''
+        what can run into an asteroid, the LOD scheduler keeps the sectors around these awake
+        '''
+        movers = self.shots.sprites()
+        if self.player is not None:
+            movers.append(self.player)
+        return movers
+
+    def resolve_collisions(self) -> bool:
+        game_stats = self.game_stats
+        # everything has moved since begin_step, so work out the awake sectors again
+        if self.lod.active:
+            self.lod.mark(self.cam.rect, self._movers(), self.store)
+        self.asteroid_hash.rebuild(self.lod.collidable(self.asteroids))
+        self.objective_hash.rebuild(self.objectives)
+
+        for objective in self.objective_hash.collisions(self.player):
+            objective.kill()
+            if objective.type == ObjectiveType.STAR:
+                game_stats.increment_stat("Stars_collected")
+                self.score += 2000
+
+        kills = []
+        for shot in self.shots:
+            for asteroid in self.asteroid_hash.collisions(shot):
+                # already split by an earlier shot this step
+                if not asteroid.alive():
+                    continue
+                shot.kill()
+                if asteroid.tier is not None:
+                    pos = asteroid.position
+                    kills.append(KillEvent(asteroid.tier, pos.x, pos.y, asteroid.radius))
+                asteroid.split()
+                break
+
+        self.kills = kills
+        self.apply_kills(kills)
+
+        return bool(self.asteroid_hash.collisions(self.player))
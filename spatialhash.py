@@ -0,0 +1,119 @@
+def torus_delta(a: float, b: float, size: float) -> float:
+    '''
+    shortest signed distance from b to a on a wrapping axis.
+    same idea as Camera._nearest_on_torus but returns the difference.
+    '''
+    if not size:
+        return a - b
+    d = (a - b) % size
+    if d > size * 0.5:
+        d -= size
+    return d
+
+def torus_overlap(a, b, world_w, world_h) -> bool:
+    '''
+    circle vs circle test that also counts overlaps across the world seams
+    '''
+    dx = torus_delta(a.position.x, b.position.x, world_w)
+    dy = torus_delta(a.position.y, b.position.y, world_h)
+    reach = a.radius + b.radius
+    return dx * dx + dy * dy <= reach * reach
+
+class SpatialHash:
+    """
+    Uniform grid broadphase over the (wrapping) world.
+    Sprites get bucketed by the cell their center is in, so a query only has to
+    look at the few cells around a point instead of the whole group.
+    Cell indices wrap around like the world does, so things on opposite sides
+    of a seam still end up as neighbours.
+    """
+
+    def __init__(self, world_w: int, world_h: int, cell_size: int = 128, wrap: bool = True):
+        self.world_w = world_w
+        self.world_h = world_h
+        self.wrap = wrap
+        # snap the cell size so a whole number of cells covers the world (needed for wrapping)
+        self.cols = max(1, int(world_w // cell_size))
+        self.rows = max(1, int(world_h // cell_size))
+        self.cell_w = world_w / self.cols
+        self.cell_h = world_h / self.rows
+        self.cells: dict[int, list] = {}
+        self.max_radius = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.max_radius = 0
+
+    def _cell(self, x: float, y: float):
+        if self.wrap:
+            x %= self.world_w
+            y %= self.world_h
+        cx = min(self.cols - 1, max(0, int(x // self.cell_w)))
+        cy = min(self.rows - 1, max(0, int(y // self.cell_h)))
+        return cx, cy
+
+    def insert(self, sprite):
+        cx, cy = self._cell(sprite.position.x, sprite.position.y)
+        key = cy * self.cols + cx
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [sprite]
+        else:
+            bucket.append(sprite)
+        if sprite.radius > self.max_radius:
+            self.max_radius = sprite.radius
+
+    def rebuild(self, sprites):
+        '''
+        clears the grid and re-inserts everything, call once per frame after movement
+        '''
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, x: float, y: float, radius: float) -> list:
+        '''
+        returns every sprite whose cell is close enough that it *might* overlap
+        a circle at (x, y). Still needs a narrow phase check.
+        '''
+        reach = radius + self.max_radius
+        cx0, cy0 = self._cell(x - reach, y - reach)
+        cx1, cy1 = self._cell(x + reach, y + reach)
+
+        if self.wrap:
+            # count cells forward so the range works when it crosses the seam
+            ncx = min(self.cols, (cx1 - cx0) % self.cols + 1)
+            ncy = min(self.rows, (cy1 - cy0) % self.rows + 1)
+            # a reach close to the world size can wrap all the way around and look like 1 cell
+            if 2 * reach >= self.cell_w * (self.cols - 1):
+                ncx = self.cols
+            if 2 * reach >= self.cell_h * (self.rows - 1):
+                ncy = self.rows
+        else:
+            ncx = cx1 - cx0 + 1
+            ncy = cy1 - cy0 + 1
+
+        found = []
+        cells = self.cells
+        for j in range(ncy):
+            row = ((cy0 + j) % self.rows) * self.cols
+            for i in range(ncx):
+                bucket = cells.get(row + (cx0 + i) % self.cols)
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def collisions(self, shape) -> list:
+        '''
+        sprites in the grid that actually overlap `shape` (anything with position and radius)
+        '''
+        hits = []
+        for other in self.query(shape.position.x, shape.position.y, shape.radius):
+            if other is shape:
+                continue
+            if self.wrap:
+                if torus_overlap(shape, other, self.world_w, self.world_h):
+                    hits.append(other)
+            elif shape.collision(other):
+                hits.append(other)
+        return hits
@@ -0,0 +1,127 @@
+import pygame
+from constants import SIM_DT, SIM_MAX_STEPS
+
+
+class FixedTimestep:
+    """
+    Turns variable frame times into a whole number of fixed size sim steps.
+    Leftover time carries over to the next frame, and `alpha` says how far we are
+    between the last two sim states so rendering can blend them.
+    """
+
+    def __init__(self, step: float = SIM_DT, max_steps: int = SIM_MAX_STEPS):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0      # sim time thrown away by the clamp, handy when debugging hitches
+
+    def advance(self, frame_dt: float) -> int:
+        '''
+        add a frame's worth of real time and return how many sim steps to run
+        '''
+        self.accumulator += frame_dt
+        # spiral of death clamp: if we fall too far behind just let the game slow
+        # down instead of running more and more steps every frame
+        limit = self.step * self.max_steps
+        if self.accumulator > limit:
+            self.dropped += self.accumulator - limit
+            self.accumulator = limit
+
+        steps = int(self.accumulator // self.step)
+        self.accumulator -= steps * self.step
+        return steps
+
+    def reset(self):
+        '''
+        forget leftover time, e.g. after sitting in a menu
+        '''
+        self.accumulator = 0.0
+
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.step
+
+
+class RenderInterpolator:
+    """
+    Remembers each sprite's previous sim state and, while rendering, swaps in
+    positions blended between that and the current state. Store-backed sprites
+    are handled in bulk by the KinematicStore, everything else one by one here.
+    """
+
+    def __init__(self, world_w: float, world_h: float, store=None, cam=None):
+        self.world_w = world_w
+        self.world_h = world_h
+        self.store = store
+        self.cam = cam
+        self._prev: dict = {}
+        self._prev_cam = None
+        self._live: list = []
+
+    def _short(self, d: float, size: float) -> float:
+        # same idea as Camera._nearest_on_torus, keeps lerps from crossing the whole world
+        if size:
+            if d > size * 0.5: d -= size
+            elif d < -size * 0.5: d += size
+        return d
+
+    def snapshot(self, sprites):
+        '''
+        call right before each sim step
+        '''
+        if self.store is not None:
+            self.store.snapshot()
+        prev = {}
+        for sprite in sprites:
+            if getattr(sprite, "_slot", None) is not None or not hasattr(sprite, "position"):
+                continue
+            prev[sprite] = (pygame.Vector2(sprite.position), getattr(sprite, "rotation", None), getattr(sprite, "angle", None))
+        self._prev = prev
+        if self.cam is not None:
+            self._prev_cam = self.cam.rect.topleft
+
+    def begin(self, sprites, alpha: float):
+        '''
+        swap in interpolated state for drawing, must be followed by end()
+        '''
+        if self.store is not None:
+            self.store.begin_render(alpha)
+
+        live = []
+        for sprite in sprites:
+            before = self._prev.get(sprite)
+            if before is None:
+                continue
+            pos, rot, ang = before
+            cur = sprite.position
+            live.append((sprite, cur, getattr(sprite, "rotation", None), getattr(sprite, "angle", None)))
+            dx = self._short(cur.x - pos.x, self.world_w)
+            dy = self._short(cur.y - pos.y, self.world_h)
+            sprite.position = pygame.Vector2(pos.x + dx * alpha, pos.y + dy * alpha)
+            if rot is not None:
+                sprite.rotation = rot + (sprite.rotation - rot) * alpha
+            if ang is not None:
+                sprite.angle = ang + (sprite.angle - ang) * alpha
+
+        if self.cam is not None and self._prev_cam is not None:
+            cur = self.cam.rect.topleft
+            live.append((self.cam, cur, None, None))
+            px, py = self._prev_cam
+            dx = self._short(cur[0] - px, self.world_w)
+            dy = self._short(cur[1] - py, self.world_h)
+            self.cam.rect.topleft = (round(px + dx * alpha), round(py + dy * alpha))
+        self._live = live
+
+    def end(self):
+        if self.store is not None:
+            self.store.end_render()
+        for obj, pos, rot, ang in self._live:
+            if obj is self.cam:
+                obj.rect.topleft = pos
+                continue
+            obj.position = pos
+            if rot is not None:
+                obj.rotation = rot
+            if ang is not None:
+                obj.angle = ang
+        self._live = []
@@ -0,0 +1,144 @@
+import pygame
+from wrapdraw import wrap_offsets
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, prepare() just does nothing without it
+    np = None
+
+
+class TorusView:
+    """
+    The camera's view of the wrapped world, worked out once per camera move
+    instead of once per sprite.
+
+    For an object at x the only copies that can be on screen are the one that
+    lands in [0, world_w) relative to the camera's left edge, and the one a
+    world width before it (when it's hanging off the far seam). So finding the
+    offsets is a divmod and two compares per axis, no Rects or Vector2s.
+    Assumes the world is at least a view plus an object wide, which it always is.
+
+    update(cam_rect) whenever the camera moves. prepare(sprites) then does the
+    offsets for a whole group in one numpy pass and hands back just the sprites
+    that can show up; offsets_of() reads those offsets back and falls back to
+    the scalar path for anything that wasn't prepared.
+    """
+
+    def __init__(self, world_w: int, world_h: int):
+        self.world_w = world_w
+        self.world_h = world_h
+        self.left = self.top = 0
+        self.view_w = self.view_h = 0
+        self._cache = {}
+
+    def update(self, cam_rect: pygame.Rect):
+        self.left, self.top = cam_rect.left, cam_rect.top
+        self.view_w, self.view_h = cam_rect.w, cam_rect.h
+        self._cache = {}
+
+    @staticmethod
+    def _axis(v, r, lo, span, size):
+        k, d = divmod(v - lo, size)
+        offs = []
+        if d < span + r:
+            offs.append(-k * size)
+        if d > size - r:
+            offs.append(-(k + 1) * size)
+        return offs
+
+    def offsets(self, x: float, y: float, r: float) -> list:
+        '''
+        [(ox, oy)] to add to a world position so the circle at (x, y) lands on screen, [] if it doesn't
+        '''
+        xs = self._axis(x, r, self.left, self.view_w, self.world_w)
+        if not xs:
+            return []
+        ys = self._axis(y, r, self.top, self.view_h, self.world_h)
+        return [(ox, oy) for ox in xs for oy in ys]
+
+    def visible(self, x: float, y: float, r: float, margin: float = 0) -> bool:
+        '''
+        is any copy of the circle inside the view grown by margin on every side
+        '''
+        m2 = margin * 2
+        return bool(self._axis(x, r, self.left - margin, self.view_w + m2, self.world_w)
+                    and self._axis(y, r, self.top - margin, self.view_h + m2, self.world_h))
+
+    def prepare(self, sprites) -> list:
+        '''
+        work out offsets for every sprite at once and return the visible ones,
+        in the order they came in. Positions come straight out of the
+        KinematicStore for sprites that live there.
+        '''
+        sprites = list(sprites)
+        n = len(sprites)
+        if np is None:
+            cache = {}
+            for s in sprites:
+                p = s.position
+                offs = self.offsets(p.x, p.y, s.radius)
+                if offs:
+                    cache[s] = offs
+            self._cache = cache
+            return list(cache)
+        if n == 0:
+            self._cache = {}
+            return []
+        pos = np.empty((n, 2))
+        radius = np.empty(n)
+        rows, slots, store = [], [], None
+        for i, s in enumerate(sprites):
+            slot = getattr(s, "_slot", None)
+            if slot is not None:
+                rows.append(i)
+                slots.append(slot)
+                store = s._store
+            else:
+                p = s.position
+                pos[i] = (p.x, p.y)
+            radius[i] = s.radius
+        if rows:
+            pos[rows] = store.pos[slots]
+
+        W, H = self.world_w, self.world_h
+        kx, dx = np.divmod(pos[:, 0] - self.left, W)
+        ky, dy = np.divmod(pos[:, 1] - self.top, H)
+        x0 = dx < self.view_w + radius
+        x1 = dx > W - radius
+        y0 = dy < self.view_h + radius
+        y1 = dy > H - radius
+        shown = np.flatnonzero((x0 | x1) & (y0 | y1))
+        # plain lists from here on, indexing numpy scalars one at a time is slow
+        ox, oy = (-kx[shown] * W).tolist(), (-ky[shown] * H).tolist()
+        x0, x1, y0, y1 = x0[shown].tolist(), x1[shown].tolist(), y0[shown].tolist(), y1[shown].tolist()
+
+        cache = {}
+        for j, i in enumerate(shown.tolist()):
+            xs = [ox[j]] if x0[j] else []
+            if x1[j]:
+                xs.append(ox[j] - W)
+            ys = [oy[j]] if y0[j] else []
+            if y1[j]:
+                ys.append(oy[j] - H)
+            cache[sprites[i]] = [(a, b) for a in xs for b in ys]
+        self._cache = cache
+        return list(cache)
+
+    def offsets_of(self, sprite) -> list:
+        offs = self._cache.get(sprite)
+        if offs is None:
+            p = sprite.position
+            offs = self.offsets(p.x, p.y, sprite.radius)
+        return offs
+
+
+def sprite_offsets(sprite, cam_rect: pygame.Rect) -> list:
+    '''
+    wrap offsets for drawing a CircleShape, from its class's TorusView when the
+    Simulation set one, otherwise the old per-sprite Rect test
+    '''
+    view = sprite.torus
+    if view is not None:
+        return view.offsets_of(sprite)
+    p, r = sprite.position, sprite.radius
+    return wrap_offsets(pygame.Rect(p.x - r, p.y - r, 2*r, 2*r), cam_rect, sprite.world_w, sprite.world_h)
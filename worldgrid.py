@@ -1,39 +1,109 @@
 import pygame
 import math
+from collections import OrderedDict
 from typing import Callable
+from constants import GRID_TILE_CACHE_BYTES
 from background import create_space_background
 
 class BackgroundGrid:
     """
     Keeps a nxm grid of background Surfaces and draws whichever tiles
     overlap the camera. With wrapping ON, the pattern repeats infinitely.
+
+    Tiles are only made the first time they come into view. Tiles that turn out
+    to be fully transparent are remembered as empty and never blitted, the rest
+    are cropped to their visible pixels. Off-screen tiles get dropped (least
+    recently seen first) once the kept tiles go over `max_bytes`, and are simply
+    made again from the same seed if they come back into view.
     """
     
-    def __init__(self, tile_w: int, tile_h: int, make_tile_fn: Callable[[int, int, int], pygame.Surface], nrows: int=3, ncols: int=3,seed_base: int=10000, call_convert: bool=True):
+    def __init__(self, tile_w: int, tile_h: int, make_tile_fn: Callable[[int, int, int], pygame.Surface], nrows: int=3, ncols: int=3,seed_base: int=10000, call_convert: bool=True, max_bytes: int=GRID_TILE_CACHE_BYTES):
         self.tile_w = tile_w
         self.tile_h = tile_h
         self.nrows = nrows
         self.ncols = ncols
-
-        # Pre-generate tiles with distinct seeds so they aren’t identical
-        self.tiles: list[list[pygame.Surface]] = []
-        
-        for row in range(self.nrows):
-            row_tiles = []
-            for col in range(self.ncols):
-                seed = seed_base + row * self.nrows + col
-                surf = make_tile_fn(tile_w, tile_h, seed)
-                if call_convert:
-                    try:
-                        surf = surf.convert() if surf.get_alpha() is None else surf.convert_alpha()
-                    except pygame.error:
-                        pass
-                row_tiles.append(surf)
-            self.tiles.append(row_tiles)
+        self.make_tile_fn = make_tile_fn
+        self.seed_base = seed_base
+        self.call_convert = call_convert
+        self.max_bytes = max_bytes
+
+        # (row, col) -> (surface, offset) for the tiles currently in memory, oldest first
+        self._tiles: OrderedDict = OrderedDict()
+        self._empty: set = set()
+        self._in_view: set = set()
+        self.bytes = 0
+        self.made = 0
+        self.evictions = 0
 
         self.world_w = tile_w * self.ncols
         self.world_h = tile_h * self.nrows
 
+    def _make(self, row: int, col: int):
+        # distinct seeds so tiles aren’t identical
+        seed = self.seed_base + row * self.nrows + col
+        surf = self.make_tile_fn(self.tile_w, self.tile_h, seed)
+        self.made += 1
+
+        # only the part with something in it is worth keeping/blitting
+        bounds = surf.get_bounding_rect()
+        if bounds.w == 0 or bounds.h == 0:
+            self._empty.add((row, col))
+            return None
+        if bounds.size != surf.get_size():
+            surf = surf.subsurface(bounds).copy()
+        if self.call_convert:
+            try:
+                surf = surf.convert() if surf.get_alpha() is None else surf.convert_alpha()
+            except pygame.error:
+                pass
+        return surf, bounds.topleft
+
+    def tile(self, row: int, col: int):
+        '''
+        (surface, offset) for a tile, making it if needed. None if the tile is empty
+        '''
+        key = (row, col)
+        entry = self._tiles.get(key)
+        if entry is not None:
+            self._tiles.move_to_end(key)
+            return entry
+        if key in self._empty:
+            return None
+
+        entry = self._make(row, col)
+        if entry is None:
+            return None
+        surf = entry[0]
+        self._tiles[key] = entry
+        self.bytes += surf.get_bytesize() * surf.get_width() * surf.get_height()
+        self._evict()
+        return entry
+
+    def _evict(self):
+        # never drop something that's on screen this frame
+        for key in list(self._tiles):
+            if self.bytes <= self.max_bytes:
+                break
+            if key in self._in_view:
+                continue
+            surf, _ = self._tiles.pop(key)
+            self.bytes -= surf.get_bytesize() * surf.get_width() * surf.get_height()
+            self.evictions += 1
+
+    def clear(self):
+        self._tiles.clear()
+        self._empty.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "tiles": len(self._tiles),
+            "empty": len(self._empty),
+            "bytes": self.bytes,
+            "made": self.made,
+            "evictions": self.evictions,
+        }
+
     def draw(self, screen: pygame.Surface, camera_rect: pygame.Rect, wrap: bool = True):
         tw, th = self.tile_w, self.tile_h
         view_w, view_h = camera_rect.w, camera_rect.h
@@ -49,6 +119,7 @@ class BackgroundGrid:
         need_cols = (view_w // tw) + 2
         need_rows = (view_h // th) + 2
 
+        visible = []
         for row in range(need_rows):
             world_row = start_row + row
             if wrap:
@@ -59,6 +130,8 @@ class BackgroundGrid:
                 trow = world_row
             
             screen_y = y0 + row * th
+            if screen_y >= view_h:
+                continue
 
             for col in range(need_cols):
                 world_col = start_col + col
@@ -70,8 +143,17 @@ class BackgroundGrid:
                     tcol = world_col
                 
                 screen_x = x0 + col * tw
-                tile = self.tiles[trow][tcol]
-                screen.blit(tile, (screen_x, screen_y))
+                if screen_x >= view_w:
+                    continue
+                visible.append((trow, tcol, screen_x, screen_y))
+
+        self._in_view = {(trow, tcol) for trow, tcol, _, _ in visible}
+        for trow, tcol, screen_x, screen_y in visible:
+            entry = self.tile(trow, tcol)
+            if entry is None:
+                continue
+            tile, (ox, oy) = entry
+            screen.blit(tile, (screen_x + ox, screen_y + oy))
 '''
         above is a cleaner way of doing below which works better with the new depth added to the background.
         